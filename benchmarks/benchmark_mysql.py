@@ -0,0 +1,457 @@
+"""
+MySQL数据库接口的吞吐量基准测试。
+
+在一个临时创建的数据库实例中写入合成数据，统计各接口的每秒行数、调用延迟分位数和进程峰值内存，
+结果保存为JSON文件，并可以与之前保存的基准结果对比，吞吐量下降超过阈值时返回非零退出码。
+
+用法示例：
+
+    python benchmarks/benchmark_mysql.py --user root --password 123456 --sizes 10000,100000
+    python benchmarks/benchmark_mysql.py --sizes 10000 --baseline baseline.json --output result.json
+"""
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser, Namespace
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+import pymysql
+
+
+# 每次调用写入的数据行数，与下载和录制数据时的典型批量接近
+SAVE_BATCH: int = 1000
+
+# K线数据分布在多个合约上，用于测试汇总信息相关接口
+BAR_SYMBOLS: int = 10
+
+# 合约信息表的数据量上限
+SYMBOL_INFO_LIMIT: int = 10000
+
+START: datetime = datetime(2020, 1, 1, 9, 0)
+
+
+def get_peak_rss() -> float | None:
+    """查询当前进程的峰值内存（MB），不支持的平台返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # macOS的单位为字节，Linux为KB
+    if sys.platform == "darwin":
+        return rss / 1024 / 1024
+    return rss / 1024
+
+
+def percentile(latencies: list[float], q: float) -> float:
+    """计算延迟分位数（毫秒）"""
+    if not latencies:
+        return 0
+    return float(np.percentile(latencies, q) * 1000)
+
+
+def generate_bars(size: int) -> Iterator[list]:
+    """按批生成多个合约的1分钟K线数据，使用固定随机种子保证可复现"""
+    from vnpy.trader.constant import Exchange, Interval
+    from vnpy.trader.object import BarData
+
+    rng: np.random.Generator = np.random.default_rng(0)
+    count: int = size // BAR_SYMBOLS
+
+    for i in range(BAR_SYMBOLS):
+        prices: np.ndarray = 3000 + np.cumsum(rng.normal(0, 1, count))
+
+        for begin in range(0, count, SAVE_BATCH):
+            yield [
+                BarData(
+                    symbol=f"bench{i}",
+                    exchange=Exchange.SHFE,
+                    datetime=START + timedelta(minutes=n),
+                    interval=Interval.MINUTE,
+                    volume=100,
+                    turnover=100 * price,
+                    open_interest=10000,
+                    open_price=price,
+                    high_price=price + 1,
+                    low_price=price - 1,
+                    close_price=price,
+                    gateway_name="BENCH"
+                )
+                for n, price in enumerate(prices[begin:begin + SAVE_BATCH].tolist(), begin)
+            ]
+
+
+def generate_ticks(size: int) -> Iterator[list]:
+    """按批生成单个合约的TICK数据，间隔500毫秒"""
+    from vnpy.trader.constant import Exchange
+    from vnpy.trader.object import TickData
+
+    rng: np.random.Generator = np.random.default_rng(0)
+    prices: np.ndarray = 3000 + np.cumsum(rng.normal(0, 1, size))
+
+    for begin in range(0, size, SAVE_BATCH):
+        yield [
+            TickData(
+                symbol="bench",
+                exchange=Exchange.SHFE,
+                datetime=START + timedelta(milliseconds=500 * n),
+                name="bench",
+                volume=n,
+                turnover=n * price,
+                open_interest=10000,
+                last_price=price,
+                last_volume=1,
+                limit_up=4000,
+                limit_down=2000,
+                bid_price_1=price - 1,
+                ask_price_1=price + 1,
+                bid_volume_1=10,
+                ask_volume_1=10,
+                localtime=START + timedelta(milliseconds=500 * n),
+                gateway_name="BENCH"
+            )
+            for n, price in enumerate(prices[begin:begin + SAVE_BATCH].tolist(), begin)
+        ]
+
+
+def generate_symbol_infos(size: int) -> list:
+    """生成合约信息数据"""
+    from vnpy_mysql.mysql_database import DbSymbolInfo
+
+    return [
+        DbSymbolInfo(
+            symbol=f"SHSE.{600000 + i}",
+            exchange="SHSE",
+            sec_type1=1010,
+            sec_type2=101001,
+            board=10100101,
+            sec_id=str(600000 + i),
+            sec_name=f"bench{i}",
+            sec_abbr=f"B{i}",
+            price_tick=0.01,
+            trade_n=1,
+            listed_date=START
+        )
+        for i in range(min(size, SYMBOL_INFO_LIMIT))
+    ]
+
+
+def time_ranges(size: int, step: timedelta) -> list[tuple[datetime, datetime]]:
+    """将数据的时间范围切分为多个读取窗口"""
+    windows: int = max(10, size // 10000)
+    length: int = max(size // windows, 1)
+
+    return [
+        (START + step * begin, START + step * (begin + length) - timedelta(microseconds=1))
+        for begin in range(0, size, length)
+    ]
+
+
+def measure(func: Callable[[Any], int], items: Iterable) -> dict:
+    """逐个执行调用并统计耗时，func返回本次调用处理的行数"""
+    latencies: list[float] = []
+    rows: int = 0
+
+    for item in items:
+        start: float = perf_counter()
+        rows += func(item)
+        latencies.append(perf_counter() - start)
+
+    seconds: float = sum(latencies)
+
+    return {
+        "calls": len(latencies),
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def run_case(case: str, size: int, settings: dict) -> dict:
+    """在独立进程中执行一项测试，保证峰值内存互不影响"""
+    from vnpy.trader.setting import SETTINGS
+    SETTINGS.update(settings)
+
+    from vnpy.trader.constant import Exchange, Interval
+    from vnpy_mysql.mysql_database import MysqlDatabase
+
+    database: MysqlDatabase = MysqlDatabase()
+
+    def save_bars(bars: list) -> int:
+        database.save_bar_data(bars)
+        return len(bars)
+
+    def save_ticks(ticks: list, stream: bool) -> int:
+        database.save_tick_data(ticks, stream=stream)
+        return len(ticks)
+
+    def load_bars(window: tuple[datetime, datetime]) -> int:
+        return len(database.load_bar_data("bench0", Exchange.SHFE, Interval.MINUTE, *window))
+
+    def load_ticks(window: tuple[datetime, datetime]) -> int:
+        return len(database.load_tick_data("bench", Exchange.SHFE, *window))
+
+    def get_overview(_: int) -> int:
+        return len(database.get_bar_overview())
+
+    def init_overview(_: int) -> int:
+        database.init_bar_overview()
+        return size
+
+    def save_infos(infos: list) -> int:
+        database.save_symbol_info(infos)
+        return len(infos)
+
+    def load_infos(_: int) -> int:
+        return len(database.load_symbol_info())
+
+    if case == "save_bar_data":
+        result: dict = measure(save_bars, generate_bars(size))
+    elif case == "save_tick_data":
+        result = measure(lambda ticks: save_ticks(ticks, False), generate_ticks(size))
+    elif case == "save_tick_data_stream":
+        result = measure(lambda ticks: save_ticks(ticks, True), generate_ticks(size))
+    elif case == "load_bar_data":
+        result = measure(load_bars, time_ranges(size // BAR_SYMBOLS, timedelta(minutes=1)))
+    elif case == "load_tick_data":
+        result = measure(load_ticks, time_ranges(size, timedelta(milliseconds=500)))
+    elif case == "get_bar_overview":
+        result = measure(get_overview, range(100))
+    elif case == "init_bar_overview":
+        result = measure(init_overview, range(3))
+    elif case == "save_symbol_info":
+        infos: list = generate_symbol_infos(size)
+        result = measure(save_infos, [infos[i:i + SAVE_BATCH] for i in range(0, len(infos), SAVE_BATCH)])
+    elif case == "load_symbol_info":
+        result = measure(load_infos, range(10))
+    else:
+        raise ValueError(f"未知的测试项目：{case}")
+
+    result["peak_rss_mb"] = get_peak_rss()
+    return result
+
+
+# 测试项目按执行顺序排列，读取类测试依赖之前写入的数据，None表示执行前清空数据表
+CASES: list[str | None] = [
+    None,
+    "save_bar_data",
+    "load_bar_data",
+    "get_bar_overview",
+    "init_bar_overview",
+    "save_tick_data",
+    None,
+    "save_tick_data_stream",
+    "load_tick_data",
+    "save_symbol_info",
+    "load_symbol_info",
+]
+
+# 读取类测试依赖的写入测试，只选择读取类测试时自动执行对应的写入测试准备数据
+SEED_CASES: dict[str, str] = {
+    "load_bar_data": "save_bar_data",
+    "get_bar_overview": "save_bar_data",
+    "init_bar_overview": "save_bar_data",
+    "load_tick_data": "save_tick_data_stream",
+    "load_symbol_info": "save_symbol_info",
+}
+
+
+def connect(args: Namespace, database: str | None = None) -> pymysql.Connection:
+    """直接连接MySQL服务器，用于创建和删除测试数据库"""
+    return pymysql.connect(
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=args.password,
+        database=database,
+        autocommit=True
+    )
+
+
+def create_database(args: Namespace) -> None:
+    """创建测试数据库，已存在时退出，避免误删数据"""
+    with connect(args) as conn, conn.cursor() as cursor:
+        if cursor.execute("SHOW DATABASES LIKE %s", (args.database,)):
+            sys.exit(f"数据库{args.database}已存在，请指定一个新的测试数据库名称")
+
+        cursor.execute(f"CREATE DATABASE `{args.database}`")
+
+    # 清除数据表结构缓存中的记录，确保在新数据库中建表
+    from vnpy.trader.utility import load_json, save_json
+    from vnpy_mysql.mysql_database import SCHEMA_FILENAME
+
+    versions: dict = load_json(SCHEMA_FILENAME)
+    for key in list(versions):
+        if key.startswith(f"{args.host}:{args.port}/{args.database}"):
+            versions.pop(key)
+    save_json(SCHEMA_FILENAME, versions)
+
+
+def truncate_tables(args: Namespace) -> None:
+    """清空测试数据库中的全部数据表"""
+    with connect(args, args.database) as conn, conn.cursor() as cursor:
+        cursor.execute("SHOW TABLES")
+        for (table,) in cursor.fetchall():
+            cursor.execute(f"TRUNCATE TABLE `{table}`")
+
+
+def drop_database(args: Namespace) -> None:
+    """删除测试数据库"""
+    with connect(args) as conn, conn.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+
+
+def get_server_version(args: Namespace) -> str:
+    """查询数据库服务器版本"""
+    with connect(args) as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT VERSION()")
+        version: str = cursor.fetchone()[0]
+        return version
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """与基准结果对比吞吐量，返回下降超过阈值的项目"""
+    previous: dict[tuple[str, int], dict] = {
+        (r["case"], r["size"]): r for r in baseline.get("results", [])
+    }
+
+    regressions: list[str] = []
+    for result in results:
+        old: dict | None = previous.get((result["case"], result["size"]), None)
+        if not old or not old["rows_per_second"]:
+            continue
+
+        change: float = result["rows_per_second"] / old["rows_per_second"] - 1
+        result["change"] = change
+
+        if change < -threshold:
+            regressions.append(
+                f"{result['case']}[{result['size']}]: "
+                f"{old['rows_per_second']:.0f} -> {result['rows_per_second']:.0f} rows/s ({change:+.1%})"
+            )
+
+    return regressions
+
+
+def main() -> None:
+    """"""
+    parser: ArgumentParser = ArgumentParser(description="MySQL数据库接口吞吐量基准测试")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="vnpy_benchmark", help="测试用数据库，不能是已存在的数据库")
+    parser.add_argument("--sizes", default="10000,100000", help="逗号分隔的数据行数，最大支持10000000")
+    parser.add_argument("--cases", default="", help="逗号分隔的测试项目，默认执行全部")
+    parser.add_argument("--output", default="benchmark_result.json", help="结果保存路径")
+    parser.add_argument("--baseline", default="", help="用于对比的基准结果文件")
+    parser.add_argument("--threshold", type=float, default=0.1, help="吞吐量下降超过该比例时视为退化")
+    parser.add_argument("--keep", action="store_true", help="结束后保留测试数据库")
+    args: Namespace = parser.parse_args()
+
+    sizes: list[int] = [int(size) for size in args.sizes.split(",")]
+    selected: set[str] = set(filter(None, args.cases.split(",")))
+
+    unknown: set[str] = selected - set(filter(None, CASES))
+    if unknown:
+        sys.exit(f"未知的测试项目：{','.join(sorted(unknown))}")
+
+    seeds: set[str] = {SEED_CASES[case] for case in selected if case in SEED_CASES} - selected
+    if selected and seeds:
+        print(f"自动执行读取类测试依赖的写入测试：{','.join(sorted(seeds))}")
+        selected |= seeds
+
+    # 固定全部可选配置，避免本机vt_setting.json中的配置影响测试结果
+    settings: dict = {
+        "database.name": "mysql",
+        "database.host": args.host,
+        "database.port": args.port,
+        "database.user": args.user,
+        "database.password": args.password,
+        "database.database": args.database,
+        "database.local_infile": False,
+        "database.max_connections": 0,
+        "database.stale_timeout": 300,
+        "database.pool_timeout": 10,
+        "database.cache_size": 0,
+        "database.compact_schema": False,
+        "database.partition_tick": False,
+        "database.partition_bar": False,
+        "database.partition_months": 3,
+        "database.file_cache": False,
+        "database.slow_query_ms": 0,
+        "database.replica_hosts": "",
+        "database.replica_retry_seconds": 30,
+        "database.read_your_writes": 0
+    }
+
+    create_database(args)
+
+    results: list[dict] = []
+    try:
+        for size in sizes:
+            for case in CASES:
+                if case is None:
+                    truncate_tables(args)
+                    continue
+                elif selected and case not in selected:
+                    continue
+
+                # 每项测试使用新的进程执行
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                    result: dict = executor.submit(run_case, case, size, settings).result()
+
+                result = {"case": case, "size": size, **result}
+                results.append(result)
+
+                print(
+                    f"{case:<24}{size:>10} rows"
+                    f"{result['rows_per_second']:>14.0f} rows/s"
+                    f"  p50 {result['p50_ms']:.2f}ms  p95 {result['p95_ms']:.2f}ms  p99 {result['p99_ms']:.2f}ms"
+                    f"  rss {result['peak_rss_mb'] or 0:.0f}MB"
+                )
+    finally:
+        if not args.keep:
+            drop_database(args)
+
+    regressions: list[str] = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    output: dict = {
+        "meta": {
+            "time": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "server": get_server_version(args),
+            "sizes": sizes
+        },
+        "results": results,
+        "regressions": regressions
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=4, ensure_ascii=False)
+
+    for regression in regressions:
+        print(f"性能退化：{regression}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from vnpy_mysql import mysql_database
+from vnpy_mysql.mysql_database import read_columns, to_db_datetimes
+
+
+SHANGHAI: ZoneInfo = ZoneInfo("Asia/Shanghai")
+UTC: ZoneInfo = ZoneInfo("UTC")
+
+AWARE: list[datetime] = [
+    datetime(2024, 1, 2, 9, 0, tzinfo=SHANGHAI),
+    datetime(2024, 1, 2, 1, 1, tzinfo=UTC),
+]
+
+
+@pytest.fixture(autouse=True)
+def db_tz(monkeypatch: pytest.MonkeyPatch) -> None:
+    """使用非UTC的数据库时区，以区分NumPy默认的UTC转换"""
+    monkeypatch.setattr(mysql_database, "DB_TZ", SHANGHAI)
+
+
+def expected(values: list[datetime]) -> np.ndarray:
+    """转换为数据库时区的本地时间"""
+    return np.array(
+        [dt.astimezone(SHANGHAI).replace(tzinfo=None) for dt in values],
+        dtype="datetime64[us]"
+    )
+
+
+def test_aware_list() -> None:
+    """带时区的datetime列表"""
+    np.testing.assert_array_equal(to_db_datetimes(AWARE), expected(AWARE))
+
+
+def test_aware_object_array() -> None:
+    """带时区的datetime对象数组"""
+    values: np.ndarray = np.array(AWARE, dtype=object)
+    np.testing.assert_array_equal(to_db_datetimes(values), expected(AWARE))
+
+
+def test_naive_values() -> None:
+    """不带时区的数据保持不变"""
+    naive: list[datetime] = [datetime(2024, 1, 2, 9, 0), datetime(2024, 1, 2, 9, 1)]
+    result: np.ndarray = np.array(naive, dtype="datetime64[us]")
+
+    np.testing.assert_array_equal(to_db_datetimes(naive), result)
+    np.testing.assert_array_equal(to_db_datetimes(result), result)
+
+
+def test_pandas_values() -> None:
+    """带时区的pandas时间序列和时间索引"""
+    pd = pytest.importorskip("pandas")
+
+    index = pd.DatetimeIndex(AWARE[:1] * 2).tz_convert(SHANGHAI)
+    np.testing.assert_array_equal(to_db_datetimes(index), expected(AWARE[:1] * 2))
+    np.testing.assert_array_equal(to_db_datetimes(pd.Series(index)), expected(AWARE[:1] * 2))
+
+
+def test_read_columns_dict() -> None:
+    """数组字典中的带时区时间列"""
+    columns: dict[str, np.ndarray] = read_columns(
+        {"datetime": AWARE, "volume": [1.0, 2.0]},
+        ["volume", "turnover"]
+    )
+
+    np.testing.assert_array_equal(columns["datetime"], expected(AWARE))
+    np.testing.assert_array_equal(columns["turnover"], np.zeros(2))
@@ -22,9 +22,11 @@
 
 
 from .mysql_database import MysqlDatabase as Database
+from .monitor import CallMetrics, MetricsCollector
+from .tick_writer import TickWriter
 
 
-__all__ = ["Database"]
+__all__ = ["Database", "TickWriter", "CallMetrics", "MetricsCollector"]
 
 
-__version__ = "1.1.0"
+__version__ = "1.2.0"
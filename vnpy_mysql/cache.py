@@ -0,0 +1,303 @@
+import os
+import shutil
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from copy import copy
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from urllib.parse import quote
+
+import numpy as np
+
+
+@dataclass
+class CacheEntry:
+    """缓存的一段连续查询结果"""
+
+    start: datetime
+    end: datetime
+    keys: list[datetime]
+    data: list
+
+
+class LoadCache:
+    """
+    按数据序列缓存已读取区间的LRU缓存。
+
+    查询区间被已缓存区间覆盖时直接从内存中切片返回，缓存总行数超过上限时淘汰最久未使用的区间。
+    所有时间均使用数据库中的无时区本地时间，返回的数据为缓存对象的副本。
+    """
+
+    def __init__(self, max_rows: int) -> None:
+        """"""
+        self.max_rows: int = max_rows
+        self.rows: int = 0
+
+        self.entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self.series: dict[tuple, set[tuple]] = {}
+        self.lock: Lock = Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        # 每次清除缓存时递增，用于丢弃查询期间已失效的结果
+        self.version: int = 0
+
+    def get(self, series: tuple, start: datetime, end: datetime) -> list | None:
+        """查询缓存，未命中时返回None"""
+        with self.lock:
+            for key in self.series.get(series, ()):
+                entry: CacheEntry = self.entries[key]
+                if entry.start <= start and end <= entry.end:
+                    break
+            else:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+            i: int = bisect_left(entry.keys, start)
+            j: int = bisect_right(entry.keys, end)
+            return [copy(d) for d in entry.data[i:j]]
+
+    def put(
+        self,
+        series: tuple,
+        start: datetime,
+        end: datetime,
+        keys: list[datetime],
+        data: list,
+        version: int
+    ) -> None:
+        """
+        缓存一段查询结果，keys为每条数据对应的数据库时间。
+
+        version为查询前读取的缓存版本，查询期间发生过清除时不写入缓存。
+        """
+        if len(data) > self.max_rows:
+            return
+
+        entry: CacheEntry = CacheEntry(start, end, keys, [copy(d) for d in data])
+        key: tuple = (series, start, end)
+
+        with self.lock:
+            if version != self.version:
+                return
+
+            self._remove(key)
+
+            self.entries[key] = entry
+            self.series.setdefault(series, set()).add(key)
+            self.rows += len(data)
+
+            while self.rows > self.max_rows:
+                oldest: tuple = next(iter(self.entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, series: tuple) -> None:
+        """清除某个数据序列的全部缓存"""
+        with self.lock:
+            self.version += 1
+
+            for key in list(self.series.get(series, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        """清除全部缓存"""
+        with self.lock:
+            self.version += 1
+
+            self.entries.clear()
+            self.series.clear()
+            self.rows = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """查询缓存的统计信息"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "rows": self.rows,
+            "max_rows": self.max_rows
+        }
+
+    def _remove(self, key: tuple) -> None:
+        """移除一个缓存区间"""
+        entry: CacheEntry | None = self.entries.pop(key, None)
+        if not entry:
+            return
+
+        self.rows -= len(entry.data)
+
+        series: tuple = key[0]
+        keys: set[tuple] = self.series[series]
+        keys.discard(key)
+        if not keys:
+            self.series.pop(series)
+
+
+class FileCache:
+    """
+    按数据序列和交易日保存已收盘数据的本地文件缓存。
+
+    每个交易日的数据保存为一个npy文件，读取时使用内存映射，没有数据的交易日保存为空数组。
+    """
+
+    def __init__(self, path: Path) -> None:
+        """"""
+        self.path: Path = path
+
+        # 每次删除缓存时递增，用于丢弃查询期间已失效的结果
+        self.version: int = 0
+
+    def get_folder(self, series: tuple) -> Path:
+        """数据序列对应的缓存目录"""
+        name: str = "_".join(str(key) for key in series)
+        return self.path.joinpath(quote(name, safe=""))
+
+    def get_file(self, series: tuple, day: date) -> Path:
+        """交易日对应的缓存文件"""
+        return self.get_folder(series).joinpath(f"{day:%Y%m%d}.npy")
+
+    def load(self, series: tuple, day: date) -> np.ndarray | None:
+        """读取交易日数据，未缓存时返回None"""
+        path: Path = self.get_file(series, day)
+        if not path.exists():
+            return None
+
+        try:
+            data: np.ndarray = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            # 文件损坏时视为未缓存
+            return None
+        return data
+
+    def save(self, series: tuple, day: date, data: np.ndarray, version: int) -> None:
+        """
+        保存交易日数据，先写入临时文件再替换，避免读到写了一半的文件。
+
+        version为查询前读取的缓存版本，查询期间发生过删除时不写入缓存。
+        """
+        if version != self.version:
+            return
+
+        folder: Path = self.get_folder(series)
+        folder.mkdir(parents=True, exist_ok=True)
+
+        path: Path = self.get_file(series, day)
+        temp: Path = path.with_suffix(f".{os.getpid()}.tmp")
+
+        with open(temp, "wb") as f:
+            np.save(f, data)
+        os.replace(temp, path)
+
+    def load_name(self, series: tuple) -> str | None:
+        """读取缓存的合约名称"""
+        path: Path = self.get_folder(series).joinpath("name.txt")
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def save_name(self, series: tuple, name: str) -> None:
+        """保存合约名称"""
+        folder: Path = self.get_folder(series)
+        folder.mkdir(parents=True, exist_ok=True)
+        folder.joinpath("name.txt").write_text(name, encoding="utf-8")
+
+    def invalidate(self, series: tuple, start: date | None = None, end: date | None = None) -> None:
+        """删除数据序列在[start, end]交易日范围内的缓存文件，不传入范围时删除全部"""
+        self.version += 1
+
+        folder: Path = self.get_folder(series)
+        if not folder.exists():
+            return
+
+        if start is None or end is None:
+            shutil.rmtree(folder, ignore_errors=True)
+            return
+
+        day: date = start
+        while day <= end:
+            self.get_file(series, day).unlink(missing_ok=True)
+            day += timedelta(days=1)
+
+    def clear(self) -> None:
+        """删除全部缓存文件"""
+        self.version += 1
+
+        for folder in self.path.iterdir():
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+class SymbolInfoCache:
+    """
+    标的物信息的内存索引，支持按代码和交易所、标的资产、品种分类和板块常数时间查询。
+
+    返回的是缓存中的共享对象，调用方不应修改。
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.infos: dict[tuple[str, str], Any] = {}
+        self.indexes: dict[str, dict[Any, dict[tuple[str, str], Any]]] = {
+            "underlying_symbol": {},
+            "sec_type": {},
+            "sec_type1": {},
+            "board": {},
+        }
+
+        # 数据表的变化标记，为(行数, 最大主键)
+        self.marker: tuple | None = None
+        self.stale: bool = True
+        self.lock: Lock = Lock()
+
+    def get_index_keys(self, info: Any) -> dict[str, Any]:
+        """标的物信息在各个索引中的键"""
+        return {
+            "underlying_symbol": info.underlying_symbol,
+            "sec_type": (info.sec_type1, info.sec_type2),
+            "sec_type1": info.sec_type1,
+            "board": info.board,
+        }
+
+    def set(self, info: Any) -> None:
+        """添加或替换一条标的物信息"""
+        key: tuple[str, str] = (info.symbol, info.exchange)
+        self.remove(key)
+
+        self.infos[key] = info
+        for name, value in self.get_index_keys(info).items():
+            self.indexes[name].setdefault(value, {})[key] = info
+
+    def remove(self, key: tuple[str, str]) -> None:
+        """移除一条标的物信息"""
+        info: Any = self.infos.pop(key, None)
+        if info is None:
+            return
+
+        for name, value in self.get_index_keys(info).items():
+            index: dict[Any, dict[tuple[str, str], Any]] = self.indexes[name]
+            index[value].pop(key, None)
+            if not index[value]:
+                index.pop(value)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self.infos.clear()
+        for index in self.indexes.values():
+            index.clear()
+
+    def get(self, symbol: str, exchange: str) -> Any:
+        """按代码和交易所查询"""
+        return self.infos.get((symbol, exchange), None)
+
+    def find(self, name: str, value: Any) -> list:
+        """按索引查询"""
+        return list(self.indexes[name].get(value, {}).values())
@@ -0,0 +1,194 @@
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock, local
+from time import perf_counter
+
+from vnpy.trader.logger import logger
+
+
+@dataclass
+class CallMetrics:
+    """
+    一次数据库接口调用的耗时统计。
+
+    query_seconds为执行SQL语句的耗时，默认的缓冲游标在执行时即读取全部结果，因此包含服务端执行和网络传输；
+    fetch_seconds为从游标读取结果的耗时，其余时间计入数据转换。
+    并行执行的查询累加各线程的耗时，因此可能超过总耗时。
+    """
+
+    method: str
+    seconds: float = 0
+    query_seconds: float = 0
+    fetch_seconds: float = 0
+    rows: int = 0
+    statements: int = 0
+
+    @property
+    def convert_seconds(self) -> float:
+        """数据转换等Python端处理的耗时"""
+        return max(self.seconds - self.query_seconds - self.fetch_seconds, 0)
+
+
+MetricsCallback = Callable[[CallMetrics], None]
+
+
+class QueryMonitor:
+    """
+    数据库接口调用监控，每次调用结束后将统计结果推送给回调函数，并记录慢查询日志。
+
+    未注册回调函数且未开启慢查询日志时不做任何统计。
+    """
+
+    def __init__(self, slow_seconds: float = 0) -> None:
+        """"""
+        self.slow_seconds: float = slow_seconds
+        self.callbacks: list[MetricsCallback] = []
+
+        self.enabled: bool = bool(slow_seconds)
+        self.local: local = local()
+
+        # 并行任务的工作线程共享调用方的统计对象，累加时需要加锁
+        self.lock: Lock = Lock()
+
+    def add_callback(self, callback: MetricsCallback) -> None:
+        """注册统计结果回调函数"""
+        self.callbacks.append(callback)
+        self.enabled = True
+
+    def remove_callback(self, callback: MetricsCallback) -> None:
+        """移除统计结果回调函数"""
+        self.callbacks.remove(callback)
+        self.enabled = bool(self.callbacks or self.slow_seconds)
+
+    def current(self) -> CallMetrics | None:
+        """当前线程正在统计的调用"""
+        return getattr(self.local, "metrics", None)
+
+    @contextmanager
+    def record(self, method: str) -> Iterator[CallMetrics]:
+        """统计一次接口调用，嵌套调用计入最外层"""
+        metrics: CallMetrics = CallMetrics(method)
+        self.local.metrics = metrics
+
+        start: float = perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds = perf_counter() - start
+            self.local.metrics = None
+
+            for callback in self.callbacks:
+                try:
+                    callback(metrics)
+                except Exception:
+                    logger.exception("数据库监控回调函数执行失败")
+
+            if self.slow_seconds and metrics.seconds >= self.slow_seconds:
+                logger.warning(
+                    "数据库慢查询：{} 耗时{:.3f}秒（查询{:.3f}秒，读取{:.3f}秒，转换{:.3f}秒），{}条语句，{}行数据",
+                    metrics.method,
+                    metrics.seconds,
+                    metrics.query_seconds,
+                    metrics.fetch_seconds,
+                    metrics.convert_seconds,
+                    metrics.statements,
+                    metrics.rows
+                )
+
+    @contextmanager
+    def attach(self, metrics: CallMetrics | None) -> Iterator[None]:
+        """在工作线程中将统计计入调用方线程正在统计的调用"""
+        previous: CallMetrics | None = self.current()
+        self.local.metrics = metrics
+        try:
+            yield
+        finally:
+            self.local.metrics = previous
+
+    def on_execute(self, seconds: float) -> None:
+        """记录一条SQL语句的执行耗时"""
+        metrics: CallMetrics | None = self.current()
+        if metrics:
+            with self.lock:
+                metrics.statements += 1
+                metrics.query_seconds += seconds
+
+    def on_fetch(self, seconds: float, rows: int) -> None:
+        """记录读取查询结果的耗时和行数"""
+        metrics: CallMetrics | None = self.current()
+        if metrics:
+            with self.lock:
+                metrics.fetch_seconds += seconds
+                metrics.rows += rows
+
+    def on_rows(self, rows: int) -> None:
+        """记录写入的数据行数"""
+        metrics: CallMetrics | None = self.current()
+        if metrics:
+            with self.lock:
+                metrics.rows += rows
+
+
+# 耗时直方图的默认分桶上界（秒）
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+
+
+class MetricsCollector:
+    """
+    按接口汇总调用统计的计数器和耗时直方图，可以作为回调函数注册到数据库监控。
+
+    to_prometheus输出Prometheus文本格式，便于通过HTTP接口暴露。
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """"""
+        self.buckets: tuple[float, ...] = buckets
+        self.lock: Lock = Lock()
+
+        self.counters: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.histograms: dict[str, list[int]] = defaultdict(lambda: [0] * len(self.buckets))
+
+    def __call__(self, metrics: CallMetrics) -> None:
+        """累加一次调用的统计结果"""
+        with self.lock:
+            counter: dict[str, float] = self.counters[metrics.method]
+            counter["calls"] += 1
+            counter["rows"] += metrics.rows
+            counter["statements"] += metrics.statements
+            counter["seconds"] += metrics.seconds
+            counter["query_seconds"] += metrics.query_seconds
+            counter["fetch_seconds"] += metrics.fetch_seconds
+            counter["convert_seconds"] += metrics.convert_seconds
+
+            histogram: list[int] = self.histograms[metrics.method]
+            for i, bound in enumerate(self.buckets):
+                if metrics.seconds <= bound:
+                    histogram[i] += 1
+
+    def get_metrics(self) -> dict[str, dict[str, float]]:
+        """查询各接口的累计统计"""
+        with self.lock:
+            return {method: dict(counter) for method, counter in self.counters.items()}
+
+    def to_prometheus(self, prefix: str = "vnpy_mysql") -> str:
+        """输出Prometheus文本格式的统计数据"""
+        lines: list[str] = []
+
+        with self.lock:
+            for name in ["calls", "rows", "statements", "query_seconds", "fetch_seconds", "convert_seconds"]:
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                for method, counter in self.counters.items():
+                    lines.append(f'{prefix}_{name}_total{{method="{method}"}} {counter[name]}')
+
+            lines.append(f"# TYPE {prefix}_call_seconds histogram")
+            for method, histogram in self.histograms.items():
+                counter = self.counters[method]
+                for bound, count in zip(self.buckets, histogram, strict=True):
+                    lines.append(f'{prefix}_call_seconds_bucket{{method="{method}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_call_seconds_bucket{{method="{method}",le="+Inf"}} {counter["calls"]:.0f}')
+                lines.append(f'{prefix}_call_seconds_sum{{method="{method}"}} {counter["seconds"]}')
+                lines.append(f'{prefix}_call_seconds_count{{method="{method}"}} {counter["calls"]:.0f}')
+
+        return "\n".join(lines) + "\n"
@@ -1,21 +1,51 @@
-from datetime import datetime
-
+import csv
+import inspect
+import io
+import os
+import tempfile
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from contextlib import contextmanager
+from functools import wraps
+from math import ceil
+from threading import Lock, local
+from time import perf_counter, sleep
+from typing import Any, TypeVar, cast
+
+import numpy as np
 from peewee import (
     AutoField,
+    Case,
     CharField,
+    CompositeKey,
     DateTimeField,
     DoubleField,
     IntegerField,
+    DatabaseProxy,
+    InterfaceError,
     Model,
     MySQLDatabase as PeeweeMySQLDatabase,
+    ModelAlias,
     ModelSelect,
     ModelDelete,
+    OperationalError,
+    Expression,
+    Field,
+    Function,
+    Node,
+    SQL,
+    Select,
+    Value,
     chunked,
-    fn,
-    Asc,
-    Desc
+    fn
 )
+from playhouse.pool import PooledMySQLDatabase
 from playhouse.shortcuts import ReconnectMixin
+from pymysql.connections import Connection
+from pymysql.cursors import SSCursor
 
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
@@ -27,19 +57,191 @@ from vnpy.trader.database import (
     convert_tz
 )
 from vnpy.trader.setting import SETTINGS
+from vnpy.trader.utility import extract_vt_symbol, get_folder_path, load_json, save_json
+
+from .cache import FileCache, LoadCache, SymbolInfoCache
+from .monitor import CallMetrics, MetricsCallback, QueryMonitor
+from .router import ReplicaRouter
+
+
+class MonitorMixin:
+    """统计SQL语句执行耗时的混入，未开启监控时直接执行"""
+
+    monitor: QueryMonitor | None = None
+
+    def execute_sql(self, sql: str, params: Any = None, commit: Any = None) -> Any:
+        """"""
+        monitor: QueryMonitor | None = self.monitor
+        if not monitor or not monitor.enabled:
+            return super().execute_sql(sql, params)  # type: ignore[misc]
+
+        start: float = perf_counter()
+        cursor: Any = super().execute_sql(sql, params)  # type: ignore[misc]
+        monitor.on_execute(perf_counter() - start)
+        return cursor
 
 
-class ReconnectMySQLDatabase(ReconnectMixin, PeeweeMySQLDatabase):
+class ReconnectMySQLDatabase(MonitorMixin, ReconnectMixin, PeeweeMySQLDatabase):
     """带有重连混入的MySQL数据库类"""
     pass
 
-db = ReconnectMySQLDatabase(
-    database=SETTINGS["database.database"],
-    user=SETTINGS["database.user"],
-    password=SETTINGS["database.password"],
-    host=SETTINGS["database.host"],
-    port=SETTINGS["database.port"]
-)
+
+class ReconnectPooledMySQLDatabase(MonitorMixin, ReconnectMixin, PooledMySQLDatabase):
+    """带有重连混入的MySQL连接池类"""
+    pass
+
+
+def create_database(host: str | None = None, port: int | None = None) -> PeeweeMySQLDatabase:
+    """根据全局配置创建数据库对象，配置了最大连接数时使用连接池，传入地址时用于连接只读副本"""
+    params: dict = {
+        "database": SETTINGS["database.database"],
+        "user": SETTINGS["database.user"],
+        "password": SETTINGS["database.password"],
+        "host": host or SETTINGS["database.host"],
+        "port": port or SETTINGS["database.port"],
+        "local_infile": SETTINGS.get("database.local_infile", False)
+    }
+
+    max_connections: int = SETTINGS.get("database.max_connections", 0)
+    if not max_connections:
+        return ReconnectMySQLDatabase(**params)
+
+    return ReconnectPooledMySQLDatabase(
+        max_connections=max_connections,
+        stale_timeout=SETTINGS.get("database.stale_timeout", 300),
+        timeout=SETTINGS.get("database.pool_timeout", 10),
+        **params
+    )
+
+
+def parse_hosts(text: str) -> list[tuple[str, int | None]]:
+    """解析逗号分隔的host:port地址列表，未填写端口时返回None"""
+    hosts: list[tuple[str, int | None]] = []
+
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+
+        host, _, port = item.partition(":")
+        hosts.append((host, int(port) if port else None))
+
+    return hosts
+
+
+class RoutingDatabaseProxy(DatabaseProxy):
+    """可以在当前线程内将查询临时路由到其他数据库对象（只读副本）的数据库代理"""
+
+    __slots__ = ("obj", "_callbacks", "_Model", "local")
+
+    def __init__(self) -> None:
+        """"""
+        self.local = local()
+        super().__init__()
+
+    def __getattr__(self, attr: str) -> Any:
+        """"""
+        target: PeeweeMySQLDatabase | None = self.current() or self.obj
+        if target is None:
+            raise AttributeError("Cannot use uninitialized Proxy.")
+        return getattr(target, attr)
+
+    def current(self) -> PeeweeMySQLDatabase | None:
+        """当前线程路由到的数据库对象，未路由时返回None，即使用主库"""
+        return getattr(self.local, "target", None)
+
+    @contextmanager
+    def route(self, target: PeeweeMySQLDatabase | None) -> Iterator[None]:
+        """在当前线程内将查询路由到target，为None时使用主库"""
+        previous: PeeweeMySQLDatabase | None = self.current()
+        self.local.target = target
+        try:
+            yield
+        finally:
+            self.local.target = previous
+
+
+# 数据库对象在首次创建MysqlDatabase时才根据全局配置初始化，导入模块时不会建立连接
+db: RoutingDatabaseProxy = RoutingDatabaseProxy()
+
+# 数据表结构版本，修改表结构时需要递增
+SCHEMA_VERSION: int = 3
+
+# 本地缓存的数据表结构版本文件，已是最新版本时启动无需查询数据库
+SCHEMA_FILENAME: str = "mysql_schema.json"
+
+
+F = TypeVar("F", bound=Callable)
+
+
+def connection_scope(func: F) -> F:
+    """
+    连接池模式下，由最外层的调用获取连接，并在调用结束后归还连接池。
+
+    非连接池模式下每个线程保持各自的连接，直接执行。首次调用时检查数据表结构。
+    """
+    if inspect.isgeneratorfunction(func):
+        @wraps(func)
+        def generator_wrapper(self: "MysqlDatabase", *args: Any, **kwargs: Any) -> Iterator:
+            if not self.pooled or not self.db.is_closed():
+                self.init_schema()
+                yield from func(self, *args, **kwargs)
+                return
+
+            # 生成器需要在迭代结束后才能归还连接
+            with self.db.connection_context():
+                self.init_schema()
+                yield from func(self, *args, **kwargs)
+
+        return cast(F, generator_wrapper)
+
+    def call(self: "MysqlDatabase", *args: Any, **kwargs: Any) -> Any:
+        if not self.pooled or not self.db.is_closed():
+            self.init_schema()
+            return func(self, *args, **kwargs)
+
+        with self.db.connection_context():
+            self.init_schema()
+            return func(self, *args, **kwargs)
+
+    @wraps(func)
+    def wrapper(self: "MysqlDatabase", *args: Any, **kwargs: Any) -> Any:
+        # 开启监控时由最外层的调用统计耗时
+        monitor: QueryMonitor = self.monitor
+        if not monitor.enabled or monitor.current():
+            return call(self, *args, **kwargs)
+
+        with monitor.record(func.__name__):
+            return call(self, *args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+def replica_scope(func: F) -> F:
+    """
+    配置了只读副本时，将只读接口路由到轮询选择的副本，需要放在connection_scope外层。
+
+    副本连接失败时标记为不可用，并改用主库重新执行。嵌套调用和数据表结构检查完成前直接执行。
+    """
+    @wraps(func)
+    def wrapper(self: "MysqlDatabase", *args: Any, **kwargs: Any) -> Any:
+        router: ReplicaRouter | None = self.router
+        if not router or self.db.current() or not self.schema_ready:
+            return func(self, *args, **kwargs)
+
+        replica: PeeweeMySQLDatabase | None = router.choose()
+        if replica is None:
+            return func(self, *args, **kwargs)
+
+        try:
+            with self.db.route(replica):
+                return func(self, *args, **kwargs)
+        except (OperationalError, InterfaceError) as e:
+            router.mark_down(replica, e)
+
+        return func(self, *args, **kwargs)
+
+    return cast(F, wrapper)
 
 
 class DateTimeMillisecondField(DateTimeField):
@@ -69,7 +271,7 @@ class DbBarData(Model):
     close_price: DoubleField = DoubleField()
 
     class Meta:
-        database: PeeweeMySQLDatabase = db
+        database: DatabaseProxy = db
         indexes: tuple = ((("symbol", "exchange", "interval", "datetime"), True),)
 
 
@@ -123,7 +325,7 @@ class DbTickData(Model):
     localtime: DateTimeField = DateTimeMillisecondField(null=True)
 
     class Meta:
-        database: PeeweeMySQLDatabase = db
+        database: DatabaseProxy = db
         indexes: tuple = ((("symbol", "exchange", "datetime"), True),)
 
 
@@ -140,7 +342,7 @@ class DbBarOverview(Model):
     end: DateTimeField = DateTimeField()
 
     class Meta:
-        database: PeeweeMySQLDatabase = db
+        database: DatabaseProxy = db
         indexes: tuple = ((("symbol", "exchange", "interval"), True),)
 
 
@@ -156,9 +358,110 @@ class DbTickOverview(Model):
     end: DateTimeField = DateTimeField()
 
     class Meta:
-        database: PeeweeMySQLDatabase = db
+        database: DatabaseProxy = db
+        indexes: tuple = ((("symbol", "exchange"), True),)
+
+
+class DbBarCoverage(Model):
+    """K线数据覆盖区间表映射对象，每行记录一段已保存的连续区间"""
+
+    id: AutoField = AutoField()
+
+    symbol: CharField = CharField()
+    exchange: CharField = CharField()
+    interval: CharField = CharField()
+    start: DateTimeField = DateTimeField()
+    end: DateTimeField = DateTimeField()
+
+    class Meta:
+        database: DatabaseProxy = db
+        indexes: tuple = ((("symbol", "exchange", "interval", "start"), False),)
+
+
+class DbInstrument(Model):
+    """合约代码映射表，紧凑格式数据表通过整数编号引用合约"""
+
+    id: AutoField = AutoField()
+
+    symbol: CharField = CharField()
+    exchange: CharField = CharField()
+    name: CharField = CharField(null=True)
+
+    class Meta:
+        database: DatabaseProxy = db
         indexes: tuple = ((("symbol", "exchange"), True),)
 
+
+class DbBarDataCompact(Model):
+    """紧凑格式的K线数据表映射对象，使用自然键作为聚簇主键"""
+
+    instrument_id: IntegerField = IntegerField()
+    interval: CharField = CharField(max_length=4)
+    datetime: DateTimeField = DateTimeField()
+
+    volume: DoubleField = DoubleField()
+    turnover: DoubleField = DoubleField()
+    open_interest: DoubleField = DoubleField()
+    open_price: DoubleField = DoubleField()
+    high_price: DoubleField = DoubleField()
+    low_price: DoubleField = DoubleField()
+    close_price: DoubleField = DoubleField()
+
+    class Meta:
+        database: DatabaseProxy = db
+        primary_key: CompositeKey = CompositeKey("instrument_id", "interval", "datetime")
+
+
+class DbTickDataCompact(Model):
+    """紧凑格式的TICK数据表映射对象，合约名称保存在合约代码映射表中"""
+
+    instrument_id: IntegerField = IntegerField()
+    datetime: DateTimeField = DateTimeMillisecondField()
+
+    volume: DoubleField = DoubleField()
+    turnover: DoubleField = DoubleField()
+    open_interest: DoubleField = DoubleField()
+    last_price: DoubleField = DoubleField()
+    last_volume: DoubleField = DoubleField()
+    limit_up: DoubleField = DoubleField()
+    limit_down: DoubleField = DoubleField()
+
+    open_price: DoubleField = DoubleField()
+    high_price: DoubleField = DoubleField()
+    low_price: DoubleField = DoubleField()
+    pre_close: DoubleField = DoubleField()
+
+    bid_price_1: DoubleField = DoubleField()
+    bid_price_2: DoubleField = DoubleField(null=True)
+    bid_price_3: DoubleField = DoubleField(null=True)
+    bid_price_4: DoubleField = DoubleField(null=True)
+    bid_price_5: DoubleField = DoubleField(null=True)
+
+    ask_price_1: DoubleField = DoubleField()
+    ask_price_2: DoubleField = DoubleField(null=True)
+    ask_price_3: DoubleField = DoubleField(null=True)
+    ask_price_4: DoubleField = DoubleField(null=True)
+    ask_price_5: DoubleField = DoubleField(null=True)
+
+    bid_volume_1: DoubleField = DoubleField()
+    bid_volume_2: DoubleField = DoubleField(null=True)
+    bid_volume_3: DoubleField = DoubleField(null=True)
+    bid_volume_4: DoubleField = DoubleField(null=True)
+    bid_volume_5: DoubleField = DoubleField(null=True)
+
+    ask_volume_1: DoubleField = DoubleField()
+    ask_volume_2: DoubleField = DoubleField(null=True)
+    ask_volume_3: DoubleField = DoubleField(null=True)
+    ask_volume_4: DoubleField = DoubleField(null=True)
+    ask_volume_5: DoubleField = DoubleField(null=True)
+
+    localtime: DateTimeField = DateTimeMillisecondField(null=True)
+
+    class Meta:
+        database: DatabaseProxy = db
+        primary_key: CompositeKey = CompositeKey("instrument_id", "datetime")
+
+
 """nifx 20250621"""
 class DbSymbolInfo(Model):
     """标的物信息表映射对象"""
@@ -186,27 +489,497 @@ class DbSymbolInfo(Model):
     delisting_begin_date = DateTimeField(null=True, verbose_name='退市整理开始日')
 
     class Meta:
-        database: PeeweeMySQLDatabase = db
+        database: DatabaseProxy = db
         indexes: tuple = ((("symbol", "exchange"), True),)
         table_name = 'tsymbolinfo'
 
 
+# K线数据的数值字段
+BAR_COLUMNS: list[str] = [
+    "volume",
+    "turnover",
+    "open_interest",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+]
+
+# TICK数据的数值字段
+TICK_COLUMNS: list[str] = [
+    "volume",
+    "turnover",
+    "open_interest",
+    "last_price",
+    "last_volume",
+    "limit_up",
+    "limit_down",
+    "open_price",
+    "high_price",
+    "low_price",
+    "pre_close",
+    *[f"bid_price_{i}" for i in range(1, 6)],
+    *[f"ask_price_{i}" for i in range(1, 6)],
+    *[f"bid_volume_{i}" for i in range(1, 6)],
+    *[f"ask_volume_{i}" for i in range(1, 6)],
+]
+
+# 列式读取时使用的结构化数组类型，时间戳为数据库时区下的本地时间
+BAR_DTYPE: np.dtype = np.dtype(
+    [("datetime", "datetime64[us]")]
+    + [(name, "f8") for name in BAR_COLUMNS]
+)
+
+TICK_DTYPE: np.dtype = np.dtype(
+    [("datetime", "datetime64[us]")]
+    + [(name, "f8") for name in TICK_COLUMNS]
+    + [("localtime", "datetime64[us]")]
+)
+
+# datetime64中NaT对应的整数值
+NAT_VALUE: int = np.iinfo(np.int64).min
+
+# 相邻K线间隔不超过该时长时视为同一段连续区间，需要大于节假日休市的长度
+COVERAGE_GAPS: dict[Interval, timedelta] = {
+    Interval.WEEKLY: timedelta(days=21),
+}
+DEFAULT_COVERAGE_GAP: timedelta = timedelta(days=10)
+
+# K线周期对应的时长，相距不超过一根K线的区间视为首尾相接
+INTERVAL_DELTAS: dict[Interval, timedelta] = {
+    Interval.MINUTE: timedelta(minutes=1),
+    Interval.HOUR: timedelta(hours=1),
+    Interval.DAILY: timedelta(days=1),
+    Interval.WEEKLY: timedelta(days=7),
+}
+
+# 并行读取时每个时间分段的目标数据行数
+SLICE_ROWS: int = 200_000
+
+
+def to_timestamp(field: Field) -> Function:
+    """在数据库端将日期时间字段转换为微秒整数"""
+    return fn.TIMESTAMPDIFF(SQL("MICROSECOND"), "1970-01-01 00:00:00", field)
+
+
+def rows_to_array(rows: list[tuple], dtype: np.dtype) -> np.ndarray:
+    """将游标返回的原始元组一次性转换为结构化数组"""
+    # 日期时间字段先按int64读取，再通过view零拷贝转换为datetime64
+    names: tuple[str, ...] = dtype.names or ()
+    raw_dtype: np.dtype = np.dtype([
+        (name, "i8" if dtype[name].kind == "M" else dtype[name])
+        for name in names
+    ])
+    return np.array(rows, dtype=raw_dtype).view(dtype)
+
+
+def to_naive(dt: datetime) -> datetime:
+    """去除时区信息，与写入数据库查询参数时的处理方式一致"""
+    return dt.replace(tzinfo=None)
+
+
+def to_db_datetimes(values: Any) -> np.ndarray:
+    """
+    将时间列统一转换为数据库时区下的datetime64数组。
+
+    带时区的pandas时间序列和时间索引一次性转换时区，列表或对象数组中带时区的datetime逐个转换，
+    不带时区的数据视为数据库时区的本地时间。
+    """
+    if getattr(getattr(values, "dt", None), "tz", None) is not None:
+        values = values.dt.tz_convert(DB_TZ).dt.tz_localize(None)
+    elif getattr(values, "tz", None) is not None and hasattr(values, "tz_convert"):
+        values = values.tz_convert(DB_TZ).tz_localize(None)
+    else:
+        # 直接转换为datetime64时，NumPy会将带时区的datetime转换为UTC时间
+        array: np.ndarray = np.asarray(values)
+        if array.dtype == object:
+            values = [
+                value.astimezone(DB_TZ).replace(tzinfo=None)
+                if isinstance(value, datetime) and value.tzinfo else value
+                for value in array.tolist()
+            ]
+    return np.asarray(values, dtype="datetime64[us]")
+
+
+def frame_names(frame: Any) -> set[str]:
+    """查询列式数据包含的字段名"""
+    if isinstance(frame, np.ndarray):
+        return set(frame.dtype.names or ())
+    return set(frame.keys())
+
+
+def read_columns(frame: Any, names: list[str]) -> dict[str, np.ndarray]:
+    """从DataFrame、结构化数组或数组字典中读取时间戳和数值字段，缺失的数值字段填充为0"""
+    existing: set[str] = frame_names(frame)
+
+    datetimes: np.ndarray = to_db_datetimes(frame["datetime"])
+    columns: dict[str, np.ndarray] = {"datetime": datetimes}
+
+    for name in names:
+        if name in existing:
+            columns[name] = np.asarray(frame[name], dtype="f8")
+        else:
+            columns[name] = np.zeros(len(datetimes))
+
+    return columns
+
+
+def next_month(dt: datetime) -> datetime:
+    """返回下个月第一天的零点"""
+    if dt.month == 12:
+        return datetime(dt.year + 1, 1, 1)
+    return datetime(dt.year, dt.month + 1, 1)
+
+
+def split_range(start: datetime, end: datetime, count: int) -> list[tuple[datetime, datetime]]:
+    """
+    将[start, end]划分为约count个首尾相接的时间分段，每段长度超过一天时按整日对齐。
+
+    每段的结束时间为下一段开始前1微秒，最后一段结束于end。
+    """
+    step: timedelta = (end - start) / max(count, 1)
+    if step <= timedelta(0):
+        return [(start, end)]
+
+    edge: datetime = start
+    if step >= timedelta(days=1):
+        step = timedelta(days=ceil(step / timedelta(days=1)))
+        edge = datetime.combine(start.date(), time(), start.tzinfo)
+
+    edges: list[datetime] = [start]
+    while True:
+        edge += step
+        if edge >= end:
+            break
+        edges.append(edge)
+
+    ranges: list[tuple[datetime, datetime]] = [
+        (begin, finish - timedelta(microseconds=1))
+        for begin, finish in zip(edges[:-1], edges[1:], strict=True)
+    ]
+    ranges.append((edges[-1], end))
+    return ranges
+
+
+def to_values(column: np.ndarray) -> list:
+    """将数组转换为Python对象列表，浮点数组中的NaN转换为None，以写入空值"""
+    values: list = column.tolist()
+    if column.dtype.kind != "f":
+        return values
+
+    for i in np.flatnonzero(np.isnan(column)).tolist():
+        values[i] = None
+    return values
+
+
+def to_csv_value(value: object) -> object:
+    """转换为LOAD DATA可以识别的CSV字段值"""
+    if value is None:
+        return "\\N"
+    elif isinstance(value, str):
+        return value.replace("\\", "\\\\")
+    return value
+
+
+@dataclass
+class BulkSaveResult:
+    """批量写入的统计结果"""
+
+    count: int = 0
+    inserted: int = 0
+    seconds: float = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        """每秒写入行数"""
+        if not self.seconds:
+            return 0
+        return self.count / self.seconds
+
+
 class MysqlDatabase(BaseDatabase):
     """Mysql数据库接口"""
 
     def __init__(self) -> None:
         """"""
-        self.db: PeeweeMySQLDatabase = db
-        self.db.connect()
+        # 只创建数据库对象，连接在首次查询时才建立
+        if db.obj is None:
+            db.initialize(create_database())
+
+        # 通过代理访问数据库，读写分离时可以在线程内临时路由到只读副本
+        self.db: RoutingDatabaseProxy = db
+        self.pooled: bool = isinstance(db.obj, PooledMySQLDatabase)
+
+        self.schema_ready: bool = False
+        self.schema_lock: Lock = Lock()
+
+        # 根据全局配置选择数据表格式，紧凑格式使用合约编号和自然键主键
+        self.compact: bool = SETTINGS.get("database.compact_schema", False)
+        if self.compact:
+            self.bar_model: type[Model] = DbBarDataCompact
+            self.tick_model: type[Model] = DbTickDataCompact
+        else:
+            self.bar_model = DbBarData
+            self.tick_model = DbTickData
+
+        self.instruments: dict[tuple[str, str], DbInstrument] = {}
+
+        # 按月分区的数据表，以及需要提前创建的未来分区月数
+        self.partitioned: list[type[Model]] = []
+        if SETTINGS.get("database.partition_tick", False):
+            self.partitioned.append(self.tick_model)
+        if SETTINGS.get("database.partition_bar", False):
+            self.partitioned.append(self.bar_model)
+
+        self.partition_months: int = SETTINGS.get("database.partition_months", 3)
+
+        # 配置了缓存行数上限时启用内存缓存
+        self.cache: LoadCache | None = None
+
+        cache_size: int = SETTINGS.get("database.cache_size", 0)
+        if cache_size:
+            self.cache = LoadCache(cache_size)
+
+        # 开启时已收盘交易日的数据缓存在本地文件中
+        self.file_cache: FileCache | None = None
+
+        if SETTINGS.get("database.file_cache", False):
+            self.file_cache = FileCache(get_folder_path("mysql_cache"))
 
-        # 如果数据表不存在，则执行创建初始化
-        if not DbBarData.table_exists():
+        # 标的物信息的内存索引，首次查询时加载
+        self.symbol_infos: SymbolInfoCache = SymbolInfoCache()
+
+        # 接口调用监控，配置了慢查询阈值或注册了回调函数时才开启统计
+        self.monitor: QueryMonitor = QueryMonitor(SETTINGS.get("database.slow_query_ms", 0) / 1000)
+        if isinstance(db.obj, MonitorMixin):
+            db.obj.monitor = self.monitor
+
+        # 配置了只读副本时开启读写分离，只读接口轮询路由到副本，写入接口使用主库
+        self.router: ReplicaRouter | None = None
+
+        hosts: list[tuple[str, int | None]] = parse_hosts(SETTINGS.get("database.replica_hosts", ""))
+        if hosts:
+            replicas: list[PeeweeMySQLDatabase] = [create_database(host, port) for host, port in hosts]
+            for replica in replicas:
+                replica.monitor = self.monitor
+
+            self.router = ReplicaRouter(
+                replicas,
+                SETTINGS.get("database.replica_retry_seconds", 30),
+                SETTINGS.get("database.read_your_writes", 0)
+            )
+
+    @contextmanager
+    def use_primary(self) -> Iterator[None]:
+        """在当前线程内从主库读取数据，用于需要读到最新写入的调用"""
+        if not self.router:
+            yield
+            return
+
+        with self.router.use_primary():
+            yield
+
+    def check_replicas(self) -> list[bool]:
+        """检查各个只读副本能否连接，并更新可用状态"""
+        if not self.router:
+            return []
+
+        results: list[bool] = []
+
+        for replica in self.router.replicas:
+            try:
+                with self.db.route(replica), self.db.connection_context():
+                    self.db.execute_sql("SELECT 1")
+            except (OperationalError, InterfaceError) as e:
+                self.router.mark_down(replica, e)
+                results.append(False)
+            else:
+                self.router.mark_up(replica)
+                results.append(True)
+
+        return results
+
+    def add_metrics_callback(self, callback: MetricsCallback) -> None:
+        """注册接口调用统计的回调函数，每次调用结束后推送CallMetrics"""
+        self.monitor.add_callback(callback)
+
+    def remove_metrics_callback(self, callback: MetricsCallback) -> None:
+        """移除接口调用统计的回调函数"""
+        self.monitor.remove_callback(callback)
+
+    def init_schema(self) -> None:
+        """检查数据表结构，每个进程只执行一次，本地记录为最新版本时跳过"""
+        if self.schema_ready:
+            return
+
+        with self.schema_lock:
+            if self.schema_ready:
+                return
+
+            key: str = "{}:{}/{}".format(
+                SETTINGS["database.host"],
+                SETTINGS["database.port"],
+                SETTINGS["database.database"]
+            )
+            if self.compact:
+                key += "/compact"
+            if self.partitioned:
+                key += "/partition:" + ",".join(model._meta.table_name for model in self.partitioned)
+            versions: dict = load_json(SCHEMA_FILENAME)
+
+            if versions.get(key, 0) < SCHEMA_VERSION:
+                self._init_tables()
+
+                versions[key] = SCHEMA_VERSION
+                save_json(SCHEMA_FILENAME, versions)
+
+            # 每个进程启动时补充创建未来月份的分区
+            for model in self.partitioned:
+                self._ensure_partitions(model)
+
+            self.schema_ready = True
+
+    def _init_tables(self) -> None:
+        """如果数据表不存在，则执行创建初始化"""
+        if self.compact:
+            if not DbBarDataCompact.table_exists():
+                self.db.create_tables([
+                    DbInstrument,
+                    DbBarDataCompact,
+                    DbTickDataCompact,
+                    DbBarOverview,
+                    DbTickOverview
+                ])
+        elif not DbBarData.table_exists():
             self.db.create_tables([DbBarData, DbTickData, DbBarOverview, DbTickOverview])
 
         # nifx 20250621如果数据表不存在，则执行创建初始化
         if not DbSymbolInfo.table_exists():
             self.db.create_tables([DbSymbolInfo])
 
+        self.db.create_tables([DbBarCoverage])
+
+        for model in self.partitioned:
+            self._partition_table(model)
+
+    def _get_partitions(self, model: type[Model]) -> dict[str, datetime | None]:
+        """查询数据表的分区及其时间上界，MAXVALUE分区的上界为None，未分区时返回空字典"""
+        cursor = self.db.execute_sql(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+            "ORDER BY PARTITION_ORDINAL_POSITION",
+            (model._meta.table_name,)
+        )
+
+        partitions: dict[str, datetime | None] = {}
+        for name, description in cursor.fetchall():
+            if not name:
+                continue
+
+            if description == "MAXVALUE":
+                partitions[name] = None
+            else:
+                partitions[name] = datetime.strptime(description.strip("'")[:10], "%Y-%m-%d")
+
+        return partitions
+
+    def _month_partitions(self, begin: datetime) -> list[str]:
+        """生成从begin所在月份到未来若干个月的按月分区定义"""
+        last: datetime = next_month(to_naive(datetime.now(DB_TZ)))
+        for _ in range(self.partition_months):
+            last = next_month(last)
+
+        month: datetime = datetime(begin.year, begin.month, 1)
+        definitions: list[str] = []
+
+        while month < last:
+            bound: datetime = next_month(month)
+            definitions.append(f"PARTITION `p{month:%Y%m}` VALUES LESS THAN ('{bound:%Y-%m-%d}')")
+            month = bound
+
+        return definitions
+
+    def _partition_table(self, model: type[Model]) -> None:
+        """将数据表转换为按月的RANGE分区表，已有数据从最早月份开始分区"""
+        if self._get_partitions(model):
+            return
+
+        table: str = model._meta.table_name
+
+        # 分区表的主键必须包含分区字段，原有格式的自增主键需要加上时间戳
+        if "id" in model._meta.fields:
+            self.db.execute_sql(
+                f"ALTER TABLE `{table}` DROP PRIMARY KEY, ADD PRIMARY KEY (`id`, `datetime`)"
+            )
+
+        first: datetime | None = model.select(fn.MIN(model.datetime)).scalar()
+        definitions: list[str] = self._month_partitions(first or to_naive(datetime.now(DB_TZ)))
+        definitions.append("PARTITION `pmax` VALUES LESS THAN (MAXVALUE)")
+
+        self.db.execute_sql(
+            f"ALTER TABLE `{table}` PARTITION BY RANGE COLUMNS(`datetime`) "
+            f"({', '.join(definitions)})"
+        )
+
+    def _ensure_partitions(self, model: type[Model]) -> None:
+        """从MAXVALUE分区中拆分出未来月份的分区"""
+        partitions: dict[str, datetime | None] = self._get_partitions(model)
+        bounds: list[datetime] = [bound for bound in partitions.values() if bound]
+        if not bounds:
+            return
+
+        definitions: list[str] = self._month_partitions(max(bounds))
+        if not definitions:
+            return
+        definitions.append("PARTITION `pmax` VALUES LESS THAN (MAXVALUE)")
+
+        self.db.execute_sql(
+            f"ALTER TABLE `{model._meta.table_name}` REORGANIZE PARTITION `pmax` "
+            f"INTO ({', '.join(definitions)})"
+        )
+
+    def _drop_partitions(self, model: type[Model], before: datetime, keys: list[str]) -> list[tuple]:
+        """
+        删除上界不晚于before的分区，返回被删除数据按keys分组的行数。
+
+        删除前只扫描待删除的分区统计行数，用于调整汇总信息。
+        """
+        names: list[str] = [
+            name for name, bound in self._get_partitions(model).items()
+            if bound and bound <= before
+        ]
+        if not names:
+            return []
+
+        table: str = model._meta.table_name
+        partition_sql: str = ", ".join(f"`{name}`" for name in names)
+        key_sql: str = ", ".join(f"`{key}`" for key in keys)
+
+        rows: list[tuple] = self.db.execute_sql(
+            f"SELECT {key_sql}, COUNT(*) FROM `{table}` PARTITION ({partition_sql}) GROUP BY {key_sql}"
+        ).fetchall()
+
+        self.db.execute_sql(f"ALTER TABLE `{table}` DROP PARTITION {partition_sql}")
+
+        if self.cache:
+            self.cache.clear()
+        if self.file_cache:
+            self.file_cache.clear()
+
+        # 紧凑格式下将合约编号映射回合约代码
+        if not self.compact:
+            return rows
+
+        instruments: dict[int, DbInstrument] = {
+            instrument.id: instrument
+            for instrument in DbInstrument.select().where(DbInstrument.id.in_([row[0] for row in rows]))
+        }
+        return [
+            (instruments[row[0]].symbol, instruments[row[0]].exchange, *row[1:])
+            for row in rows
+        ]
+
+    @connection_scope
     def save_bar_data(self, bars: list[BarData], stream: bool = False) -> bool:
         """保存K线数据"""
         # 读取主键参数
@@ -216,59 +989,30 @@ class MysqlDatabase(BaseDatabase):
         interval: Interval = bar.interval
 
         # 将BarData数据转换为字典，并调整时区
-        data: list = []
-
-        for bar in bars:
-            bar.datetime = convert_tz(bar.datetime)
-
-            d: dict = bar.__dict__
-            d["exchange"] = d["exchange"].value
-            d["interval"] = d["interval"].value
-            d.pop("gateway_name")
-            d.pop("vt_symbol")
-            if "extra" in d:
-                # 如果有extra字段，则删除
-                d.pop("extra")
-            data.append(d)
-
-        # 使用upsert操作将数据更新到数据库中
-        with self.db.atomic():
-            for c in chunked(data, 50):
-                DbBarData.insert_many(c).on_conflict_replace().execute()
-
-        # 更新K线汇总数据
-        overview: DbBarOverview = DbBarOverview.get_or_none(
-            DbBarOverview.symbol == symbol,
-            DbBarOverview.exchange == exchange.value,
-            DbBarOverview.interval == interval.value,
-        )
-
-        if not overview:
-            overview = DbBarOverview()
-            overview.symbol = symbol
-            overview.exchange = exchange.value
-            overview.interval = interval.value
-            overview.start = bars[0].datetime
-            overview.end = bars[-1].datetime
-            overview.count = len(bars)
-        elif stream:
-            overview.end = bars[-1].datetime
-            overview.count += len(bars)
-        else:
-            overview.start = min(bars[0].datetime, overview.start)
-            overview.end = max(bars[-1].datetime, overview.end)
-
-            s: ModelSelect = DbBarData.select().where(
-                (DbBarData.symbol == symbol)
-                & (DbBarData.exchange == exchange.value)
-                & (DbBarData.interval == interval.value)
-            )
-            overview.count = s.count()
+        data: list[dict] = self._convert_bars(bars)
+
+        # 使用upsert操作将数据更新到数据库中，并统计新增行数
+        count: int = self._replace_rows(self.bar_model, data)
+
+        start: datetime = min(d["datetime"] for d in data)
+        end: datetime = max(d["datetime"] for d in data)
+        self._invalidate_cache(("bar", symbol, exchange.value, interval.value), start, end)
+
+        # 按增量更新K线汇总数据，stream参数仅为兼容保留
+        self._update_bar_overview(
+            symbol,
+            exchange,
+            interval,
+            start,
+            end,
+            count
+        )
 
-        overview.save()
+        self._add_bar_coverage(symbol, exchange, interval, start, end)
 
         return True
 
+    @connection_scope
     def save_tick_data(self, ticks: list[TickData], stream: bool = False) -> bool:
         """保存TICK数据"""
         # 读取主键参数
@@ -277,205 +1021,2148 @@ class MysqlDatabase(BaseDatabase):
         exchange: Exchange = tick.exchange
 
         # 将TickData数据转换为字典，并调整时区
-        data: list = []
+        data: list[dict] = self._convert_ticks(ticks)
+
+        # 使用upsert操作将数据更新到数据库中，并统计新增行数
+        count: int = self._replace_rows(self.tick_model, data)
+
+        start: datetime = min(d["datetime"] for d in data)
+        end: datetime = max(d["datetime"] for d in data)
+        self._invalidate_cache(("tick", symbol, exchange.value), start, end)
+
+        # 按增量更新Tick汇总数据，stream参数仅为兼容保留
+        self._update_tick_overview(
+            symbol,
+            exchange,
+            start,
+            end,
+            count
+        )
 
-        for tick in ticks:
-            tick.datetime = convert_tz(tick.datetime)
+        return True
 
-            d: dict = tick.__dict__
-            d["exchange"] = d["exchange"].value
-            d.pop("gateway_name")
-            d.pop("vt_symbol")
-            d.pop("extra")
-            data.append(d)
+    @connection_scope
+    def save_tick_data_multi(self, ticks: list[TickData], batch_size: int = 1000) -> bool:
+        """保存多个合约的TICK数据，使用跨合约的批量插入，并一次性更新汇总数据"""
+        data: list[dict] = self._convert_ticks(ticks)
+
+        # 按合约统计本次写入的时间范围和行数
+        overviews: dict[tuple[str, str], dict] = {}
+        for d in data:
+            key: tuple[str, str] = (d["symbol"], d["exchange"])
+            overview: dict | None = overviews.get(key, None)
+
+            if not overview:
+                overviews[key] = {
+                    "symbol": d["symbol"],
+                    "exchange": d["exchange"],
+                    "count": 0,
+                    "start": d["datetime"],
+                    "end": d["datetime"]
+                }
+            else:
+                overview["start"] = min(overview["start"], d["datetime"])
+                overview["end"] = max(overview["end"], d["datetime"])
 
-        # 使用upsert操作将数据更新到数据库中
         with self.db.atomic():
-            for c in chunked(data, 50):
-                DbTickData.insert_many(c).on_conflict_replace().execute()
-
-        # 更新Tick汇总数据
-        overview: DbTickOverview = DbTickOverview.get_or_none(
-            DbTickOverview.symbol == symbol,
-            DbTickOverview.exchange == exchange.value,
-        )
-
-        if not overview:
-            overview = DbTickOverview()
-            overview.symbol = symbol
-            overview.exchange = exchange.value
-            overview.start = ticks[0].datetime
-            overview.end = ticks[-1].datetime
-            overview.count = len(ticks)
-        elif stream:
-            overview.end = ticks[-1].datetime
-            overview.count += len(ticks)
-        else:
-            overview.start = min(ticks[0].datetime, overview.start)
-            overview.end = max(ticks[-1].datetime, overview.end)
+            for c in chunked(data, batch_size):
+                rows: list[dict] = self._storage_rows(c)
 
-            s: ModelSelect = DbTickData.select().where(
-                (DbTickData.symbol == symbol)
-                & (DbTickData.exchange == exchange.value)
-            )
-            overview.count = s.count()
+                # 写入前按合约查询已有的行数，得到各合约新增行数的准确增量
+                dts: dict[tuple[str, str], set[datetime]] = defaultdict(set)
+                for d in c:
+                    dts[(d["symbol"], d["exchange"])].add(d["datetime"])
 
-        overview.save()
+                existing: dict[tuple[str, str], int] = self._count_existing_ticks(dts)
+                for key, values in dts.items():
+                    overviews[key]["count"] += len(values) - existing.get(key, 0)
+
+                self.tick_model.insert_many(rows).on_conflict_replace().execute()
+
+            self._update_tick_overviews(list(overviews.values()))
+            self.monitor.on_rows(len(data))
+
+        for (symbol, exchange), overview in overviews.items():
+            self._invalidate_cache(("tick", symbol, exchange), overview["start"], overview["end"])
 
         return True
 
-    def load_bar_data(
+    @connection_scope
+    def bulk_save_bar_data(
         self,
-        symbol: str,
-        exchange: Exchange,
-        interval: Interval,
-        start: datetime,
-        end: datetime
-    ) -> list[BarData]:
-        """"""
-        s: ModelSelect = (
-            DbBarData.select().where(
-                (DbBarData.symbol == symbol)
-                & (DbBarData.exchange == exchange.value)
-                & (DbBarData.interval == interval.value)
-                & (DbBarData.datetime >= start)
-                & (DbBarData.datetime <= end)
-            ).order_by(DbBarData.datetime)
+        bars: list[BarData],
+        batch_size: int = 5000,
+        load_data: bool = False
+    ) -> BulkSaveResult:
+        """
+        批量导入K线数据，冲突时使用ON DUPLICATE KEY UPDATE更新。
+
+        每个批次单独提交事务，load_data为True时通过LOAD DATA LOCAL INFILE导入，
+        需要在全局配置中开启database.local_infile。
+        """
+        bar: BarData = bars[0]
+        symbol: str = bar.symbol
+        exchange: Exchange = bar.exchange
+        interval: Interval | None = bar.interval
+        if interval is None:
+            raise ValueError("K线数据缺少周期（interval），无法批量导入")
+
+        data: list[dict] = self._convert_bars(bars)
+
+        result: BulkSaveResult = self._bulk_insert(
+            self.bar_model,
+            data,
+            BAR_COLUMNS,
+            self._bar_filter(symbol, exchange, interval),
+            batch_size,
+            load_data
+        )
+        start: datetime = min(d["datetime"] for d in data)
+        end: datetime = max(d["datetime"] for d in data)
+        self._invalidate_cache(("bar", symbol, exchange.value, interval.value), start, end)
+
+        self._update_bar_overview(
+            symbol,
+            exchange,
+            interval,
+            start,
+            end,
+            result.inserted
         )
 
-        bars: list[BarData] = []
-        for db_bar in s:
-            bar: BarData = BarData(
-                symbol=db_bar.symbol,
-                exchange=Exchange(db_bar.exchange),
-                datetime=datetime.fromtimestamp(db_bar.datetime.timestamp(), DB_TZ),
-                interval=Interval(db_bar.interval),
-                volume=db_bar.volume,
-                turnover=db_bar.turnover,
-                open_interest=db_bar.open_interest,
-                open_price=db_bar.open_price,
-                high_price=db_bar.high_price,
-                low_price=db_bar.low_price,
-                close_price=db_bar.close_price,
-                gateway_name="DB"
-            )
-            bars.append(bar)
+        self._add_bar_coverage(symbol, exchange, interval, start, end)
 
-        return bars
+        return result
 
-    def load_tick_data(
+    @connection_scope
+    def bulk_save_tick_data(
         self,
-        symbol: str,
-        exchange: Exchange,
-        start: datetime,
-        end: datetime
-    ) -> list[TickData]:
-        """读取TICK数据"""
-        s: ModelSelect = (
-            DbTickData.select().where(
-                (DbTickData.symbol == symbol)
-                & (DbTickData.exchange == exchange.value)
-                & (DbTickData.datetime >= start)
-                & (DbTickData.datetime <= end)
-            ).order_by(DbTickData.datetime)
-        )
-
-        ticks: list[TickData] = []
-        for db_tick in s:
-            tick: TickData = TickData(
-                symbol=db_tick.symbol,
-                exchange=Exchange(db_tick.exchange),
-                datetime=datetime.fromtimestamp(db_tick.datetime.timestamp(), DB_TZ),
-                name=db_tick.name,
-                volume=db_tick.volume,
-                turnover=db_tick.turnover,
-                open_interest=db_tick.open_interest,
-                last_price=db_tick.last_price,
-                last_volume=db_tick.last_volume,
-                limit_up=db_tick.limit_up,
-                limit_down=db_tick.limit_down,
-                open_price=db_tick.open_price,
-                high_price=db_tick.high_price,
-                low_price=db_tick.low_price,
-                pre_close=db_tick.pre_close,
-                bid_price_1=db_tick.bid_price_1,
-                bid_price_2=db_tick.bid_price_2,
-                bid_price_3=db_tick.bid_price_3,
-                bid_price_4=db_tick.bid_price_4,
-                bid_price_5=db_tick.bid_price_5,
-                ask_price_1=db_tick.ask_price_1,
-                ask_price_2=db_tick.ask_price_2,
-                ask_price_3=db_tick.ask_price_3,
-                ask_price_4=db_tick.ask_price_4,
-                ask_price_5=db_tick.ask_price_5,
-                bid_volume_1=db_tick.bid_volume_1,
-                bid_volume_2=db_tick.bid_volume_2,
-                bid_volume_3=db_tick.bid_volume_3,
-                bid_volume_4=db_tick.bid_volume_4,
-                bid_volume_5=db_tick.bid_volume_5,
-                ask_volume_1=db_tick.ask_volume_1,
-                ask_volume_2=db_tick.ask_volume_2,
-                ask_volume_3=db_tick.ask_volume_3,
-                ask_volume_4=db_tick.ask_volume_4,
-                ask_volume_5=db_tick.ask_volume_5,
-                localtime=db_tick.localtime,
-                gateway_name="DB"
-            )
-            ticks.append(tick)
+        ticks: list[TickData],
+        batch_size: int = 5000,
+        load_data: bool = False
+    ) -> BulkSaveResult:
+        """
+        批量导入TICK数据，冲突时使用ON DUPLICATE KEY UPDATE更新。
+
+        每个批次单独提交事务，load_data为True时通过LOAD DATA LOCAL INFILE导入，
+        需要在全局配置中开启database.local_infile。
+        """
+        tick: TickData = ticks[0]
+        symbol: str = tick.symbol
+        exchange: Exchange = tick.exchange
 
-        return ticks
+        data: list[dict] = self._convert_ticks(ticks)
 
-    def delete_bar_data(
+        result: BulkSaveResult = self._bulk_insert(
+            self.tick_model,
+            data,
+            ["name", *TICK_COLUMNS, "localtime"],
+            self._tick_filter(symbol, exchange),
+            batch_size,
+            load_data
+        )
+        start: datetime = min(d["datetime"] for d in data)
+        end: datetime = max(d["datetime"] for d in data)
+        self._invalidate_cache(("tick", symbol, exchange.value), start, end)
+
+        self._update_tick_overview(
+            symbol,
+            exchange,
+            start,
+            end,
+            result.inserted
+        )
+
+        return result
+
+    @connection_scope
+    def save_bar_frame(
         self,
+        frame: Any,
         symbol: str,
         exchange: Exchange,
-        interval: Interval
+        interval: Interval,
+        batch_size: int = 5000,
+        load_data: bool = False
+    ) -> BulkSaveResult:
+        """
+        批量导入列式K线数据，不创建BarData对象。
+
+        frame可以是pandas.DataFrame、结构化数组或以字段名为键的数组字典，包含datetime和BAR_COLUMNS字段。
+        """
+        columns: dict[str, np.ndarray] = read_columns(frame, BAR_COLUMNS)
+        if not len(columns["datetime"]):
+            return BulkSaveResult()
+
+        result: BulkSaveResult = self._insert_columns(
+            self.bar_model,
+            self._series_columns(symbol, exchange, interval),
+            columns,
+            BAR_COLUMNS,
+            self._bar_filter(symbol, exchange, interval),
+            batch_size,
+            load_data
+        )
+        start: datetime = columns["datetime"].min().item()
+        end: datetime = columns["datetime"].max().item()
+        self._invalidate_cache(("bar", symbol, exchange.value, interval.value), start, end)
+
+        self._update_bar_overview(symbol, exchange, interval, start, end, result.inserted)
+        self._add_bar_coverage(symbol, exchange, interval, start, end)
+
+        return result
+
+    @connection_scope
+    def save_tick_frame(
+        self,
+        frame: Any,
+        symbol: str,
+        exchange: Exchange,
+        name: str = "",
+        batch_size: int = 5000,
+        load_data: bool = False
+    ) -> BulkSaveResult:
+        """
+        批量导入列式TICK数据，不创建TickData对象。
+
+        frame包含datetime、TICK_COLUMNS和可选的localtime字段，name为合约名称。
+        """
+        columns: dict[str, np.ndarray] = read_columns(frame, TICK_COLUMNS)
+        if not len(columns["datetime"]):
+            return BulkSaveResult()
+
+        if "localtime" in frame_names(frame):
+            columns["localtime"] = to_db_datetimes(frame["localtime"])
+
+        series: dict = self._series_columns(symbol, exchange, name=name)
+        if not self.compact:
+            series["name"] = name
+
+        result: BulkSaveResult = self._insert_columns(
+            self.tick_model,
+            series,
+            columns,
+            TICK_COLUMNS,
+            self._tick_filter(symbol, exchange),
+            batch_size,
+            load_data
+        )
+        start: datetime = columns["datetime"].min().item()
+        end: datetime = columns["datetime"].max().item()
+        self._invalidate_cache(("tick", symbol, exchange.value), start, end)
+
+        self._update_tick_overview(symbol, exchange, start, end, result.inserted)
+
+        return result
+
+    @connection_scope
+    def build_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime | None = None,
+        end: datetime | None = None
     ) -> int:
-        """删除K线数据"""
-        d: ModelDelete = DbBarData.delete().where(
-            (DbBarData.symbol == symbol)
-            & (DbBarData.exchange == exchange.value)
-            & (DbBarData.interval == interval.value)
+        """
+        使用数据库中的TICK数据合成1分钟K线并保存，返回写入的K线数量。
+
+        未传入start时从已有1分钟K线的最后一根开始增量合成，该K线会被重新合成覆盖。
+        """
+        model: type[Model] = self.tick_model
+
+        if start:
+            begin: datetime = convert_tz(start)
+        else:
+            overview: DbBarOverview | None = DbBarOverview.get_or_none(
+                DbBarOverview.symbol == symbol,
+                DbBarOverview.exchange == exchange.value,
+                DbBarOverview.interval == Interval.MINUTE.value
+            )
+            if overview:
+                begin = overview.end
+            else:
+                first: datetime | None = (
+                    model.select(fn.MIN(model.datetime))
+                    .where(self._tick_filter(symbol, exchange))
+                    .scalar()
+                )
+                if not first:
+                    return 0
+                begin = first
+
+        # 从所在分钟的开始合成
+        begin = begin.replace(second=0, microsecond=0)
+
+        condition: Expression = self._tick_filter(symbol, exchange) & (model.datetime >= begin)
+        if end:
+            condition &= model.datetime <= convert_tz(end)
+
+        # 按分钟分组统计最高最低价，并定位每分钟的第一个和最后一个TICK
+        minute: Node = fn.TIMESTAMPDIFF(SQL("MINUTE"), "1970-01-01 00:00:00", model.datetime)
+
+        g: ModelSelect = (
+            model.select(
+                minute.alias("minute"),
+                fn.MIN(model.datetime).alias("first"),
+                fn.MAX(model.datetime).alias("last"),
+                fn.MAX(model.last_price).alias("high_price"),
+                fn.MIN(model.last_price).alias("low_price")
+            ).where(
+                condition & (model.last_price > 0)
+            ).group_by(minute)
+        ).alias("g")
+
+        o: ModelAlias = model.alias("o")
+        c: ModelAlias = model.alias("c")
+
+        s: ModelSelect = (
+            o.select(
+                g.c.minute,
+                o.last_price,
+                g.c.high_price,
+                g.c.low_price,
+                c.last_price,
+                c.volume,
+                c.turnover,
+                c.open_interest,
+                o.volume,
+                o.turnover
+            ).join(
+                g,
+                on=(o.datetime == g.c.first)
+            ).join_from(
+                g,
+                c,
+                on=(c.datetime == g.c.last)
+            ).where(
+                self._tick_filter(symbol, exchange, o)
+                & self._tick_filter(symbol, exchange, c)
+            ).order_by(g.c.minute)
         )
-        count: int = d.execute()
 
-        # 删除K线汇总数据
-        d2: ModelDelete = DbBarOverview.delete().where(
-            (DbBarOverview.symbol == symbol)
-            & (DbBarOverview.exchange == exchange.value)
-            & (DbBarOverview.interval == interval.value)
+        rows: list[tuple] = self._fetch_rows(s)
+        if not rows:
+            return 0
+
+        data: np.ndarray = np.array(rows, dtype="f8")
+
+        # 成交量和成交额为累计值，使用开始时间前最后一个TICK作为差分基准，
+        # 没有更早的TICK时使用第一分钟的第一个TICK，第一根K线取分钟内的变化量
+        previous: tuple | None = (
+            model.select(model.volume, model.turnover)
+            .where(self._tick_filter(symbol, exchange) & (model.datetime < begin))
+            .order_by(model.datetime.desc())
+            .limit(1)
+            .tuples()
+            .first()
+        )
+
+        changes: dict[str, np.ndarray] = {}
+        for i, j, name in ((5, 8, "volume"), (6, 9, "turnover")):
+            total: np.ndarray = data[:, i]
+            base: float = previous[i - 5] if previous else data[0, j]
+            change: np.ndarray = np.diff(total, prepend=base)
+
+            # 累计值减少说明跨越了交易日，新交易日的累计值即为本分钟的变化量
+            changes[name] = np.where(change < 0, total, change)
+
+        times: list[datetime] = data[:, 0].astype("i8").astype("datetime64[m]").astype("datetime64[us]").tolist()
+
+        bars: list[BarData] = [
+            BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt.replace(tzinfo=DB_TZ),
+                interval=Interval.MINUTE,
+                open_price=row[1],
+                high_price=row[2],
+                low_price=row[3],
+                close_price=row[4],
+                volume=volume,
+                turnover=turnover,
+                open_interest=row[7],
+                gateway_name="DB"
+            )
+            for dt, row, volume, turnover in zip(
+                times,
+                data.tolist(),
+                changes["volume"].tolist(),
+                changes["turnover"].tolist(),
+                strict=True
+            )
+        ]
+
+        self.save_bar_data(bars)
+        return len(bars)
+
+    def _get_instrument(
+        self,
+        symbol: str,
+        exchange: str,
+        name: str | None = None,
+        create: bool = False
+    ) -> DbInstrument | None:
+        """查询紧凑格式下的合约代码映射，create为True时不存在则创建"""
+        key: tuple[str, str] = (symbol, exchange)
+
+        instrument: DbInstrument | None = self.instruments.get(key, None)
+        if instrument:
+            return instrument
+
+        instrument = DbInstrument.get_or_none(
+            DbInstrument.symbol == symbol,
+            DbInstrument.exchange == exchange
+        )
+
+        if not instrument and create:
+            DbInstrument.insert(
+                symbol=symbol,
+                exchange=exchange,
+                name=name
+            ).on_conflict_ignore().execute()
+
+            instrument = DbInstrument.get(
+                DbInstrument.symbol == symbol,
+                DbInstrument.exchange == exchange
+            )
+
+        if instrument:
+            self.instruments[key] = instrument
+        return instrument
+
+    def _bar_filter(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        model: type[Model] | ModelAlias | None = None
+    ) -> Expression:
+        """生成K线数据序列的查询条件，model用于指定数据表的别名"""
+        model = model or self.bar_model
+
+        if not self.compact:
+            return (
+                (model.symbol == symbol)
+                & (model.exchange == exchange.value)
+                & (model.interval == interval.value)
+            )
+
+        # 合约不存在时使用无效编号，查询结果为空
+        instrument: DbInstrument | None = self._get_instrument(symbol, exchange.value)
+        instrument_id: int = instrument.id if instrument else 0
+
+        return (
+            (model.instrument_id == instrument_id)
+            & (model.interval == interval.value)
+        )
+
+    def _tick_filter(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        model: type[Model] | ModelAlias | None = None
+    ) -> Expression:
+        """生成TICK数据序列的查询条件，model用于指定数据表的别名"""
+        model = model or self.tick_model
+
+        if not self.compact:
+            return (
+                (model.symbol == symbol)
+                & (model.exchange == exchange.value)
+            )
+
+        instrument: DbInstrument | None = self._get_instrument(symbol, exchange.value)
+        instrument_id: int = instrument.id if instrument else 0
+
+        return model.instrument_id == instrument_id
+
+    def _count_existing_ticks(self, dts: dict[tuple[str, str], set[datetime]]) -> dict[tuple[str, str], int]:
+        """使用一次分组查询统计多个合约在指定时间戳上已有的TICK行数"""
+        model: type[Model] = self.tick_model
+
+        condition: Expression | None = None
+        for (symbol, exchange), values in dts.items():
+            c: Expression = self._tick_filter(symbol, Exchange(exchange)) & model.datetime.in_(list(values))
+            condition = c if condition is None else (condition | c)
+
+        if self.compact:
+            keys: dict[int, tuple[str, str]] = {}
+            for symbol, exchange in dts:
+                instrument: DbInstrument | None = self._get_instrument(symbol, exchange)
+                if instrument:
+                    keys[instrument.id] = (symbol, exchange)
+
+            s: ModelSelect = (
+                model.select(model.instrument_id, fn.COUNT(SQL("*")))
+                .where(condition)
+                .group_by(model.instrument_id)
+            )
+            return {keys[instrument_id]: count for instrument_id, count in s.tuples()}
+
+        s = (
+            model.select(model.symbol, model.exchange, fn.COUNT(SQL("*")))
+            .where(condition)
+            .group_by(model.symbol, model.exchange)
         )
-        d2.execute()
+        return {(symbol, exchange): count for symbol, exchange, count in s.tuples()}
+
+    def _storage_rows(self, data: list[dict]) -> list[dict]:
+        """紧凑格式下将合约代码替换为合约编号，合约名称写入合约代码映射表"""
+        if not self.compact:
+            return data
+
+        rows: list[dict] = []
+        for d in data:
+            row: dict = d.copy()
+            symbol: str = row.pop("symbol")
+            exchange: str = row.pop("exchange")
+            name: str | None = row.pop("name", None)
+
+            instrument: DbInstrument | None = self._get_instrument(symbol, exchange, name, True)
+            if instrument:
+                row["instrument_id"] = instrument.id
+            rows.append(row)
+
+        return rows
+
+    def _invalidate_cache(
+        self,
+        series: tuple,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> None:
+        """数据写入或删除后清除对应序列的缓存，文件缓存只删除[start, end]范围内的交易日"""
+        if self.router:
+            self.router.on_write()
+
+        if self.cache:
+            self.cache.invalidate(series)
+
+        if self.file_cache:
+            if start and end:
+                self.file_cache.invalidate(series, start.date(), end.date())
+            else:
+                self.file_cache.invalidate(series)
+
+    def _convert_bars(self, bars: list[BarData]) -> list[dict]:
+        """将BarData数据转换为字典，并调整时区"""
+        data: list[dict] = []
+
+        for bar in bars:
+            # 复制字典，避免修改调用方传入的对象
+            d: dict = bar.__dict__.copy()
+            d["datetime"] = convert_tz(bar.datetime)
+            d["exchange"] = d["exchange"].value
+            d["interval"] = d["interval"].value
+            d.pop("gateway_name")
+            d.pop("vt_symbol")
+            # 如果有extra字段，则删除
+            d.pop("extra", None)
+            data.append(d)
+
+        return data
+
+    def _convert_ticks(self, ticks: list[TickData]) -> list[dict]:
+        """将TickData数据转换为字典，并调整时区"""
+        data: list[dict] = []
+
+        for tick in ticks:
+            # 复制字典，避免修改调用方传入的对象
+            d: dict = tick.__dict__.copy()
+            d["datetime"] = convert_tz(tick.datetime)
+            d["exchange"] = d["exchange"].value
+            d.pop("gateway_name")
+            d.pop("vt_symbol")
+            d.pop("extra", None)
+            data.append(d)
+
+        return data
+
+    def _bulk_insert(
+        self,
+        model: type[Model],
+        data: list[dict],
+        columns: list[str],
+        condition: Expression,
+        batch_size: int,
+        load_data: bool
+    ) -> BulkSaveResult:
+        """分批写入数据，并统计写入速度"""
+        # 冲突时只更新数值字段，保留原有的自增主键和索引项
+        columns = [name for name in columns if name in model._meta.fields]
+        preserve: list[Field] = [getattr(model, name) for name in columns]
+
+        inserted: int = 0
+        start: float = perf_counter()
+
+        for c in chunked(data, batch_size):
+            rows: list[dict] = self._storage_rows(c)
+
+            with self.db.atomic():
+                # ON DUPLICATE KEY UPDATE的影响行数无法区分新增和更新，需要先查询已有的行数
+                dts: set[datetime] = {d["datetime"] for d in rows}
+                existing: int = model.select().where(condition & model.datetime.in_(list(dts))).count()
+                inserted += len(dts) - existing
+
+                if load_data:
+                    names: list[str] = [name for name in model._meta.fields if name in rows[0]]
+                    values: list[tuple] = [tuple(d[name] for name in names) for d in rows]
+                    self._load_data_infile(model, names, values, columns)
+                else:
+                    model.insert_many(rows).on_conflict(preserve=preserve).execute()
+
+        self.monitor.on_rows(len(data))
+
+        seconds: float = perf_counter() - start
+        return BulkSaveResult(count=len(data), inserted=inserted, seconds=seconds)
+
+    def _series_columns(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval | None = None,
+        name: str | None = None
+    ) -> dict:
+        """生成列式写入时每行相同的数据序列字段"""
+        if self.compact:
+            instrument: DbInstrument | None = self._get_instrument(symbol, exchange.value, name, True)
+            series: dict = {"instrument_id": instrument.id if instrument else 0}
+        else:
+            series = {"symbol": symbol, "exchange": exchange.value}
+
+        if interval:
+            series["interval"] = interval.value
+        return series
+
+    def _insert_columns(
+        self,
+        model: type[Model],
+        series: dict,
+        columns: dict[str, np.ndarray],
+        update_columns: list[str],
+        condition: Expression,
+        batch_size: int,
+        load_data: bool
+    ) -> BulkSaveResult:
+        """分批写入列式数据，每行只生成字段值元组，冲突时更新数值字段"""
+        names: list[str] = [*series, *columns]
+        fields: list[Field] = [getattr(model, name) for name in names]
+        constants: tuple = tuple(series.values())
+
+        update_columns = [name for name in update_columns if name in model._meta.fields]
+        preserve: list[Field] = [getattr(model, name) for name in update_columns]
+
+        # 写入前检查不能为空的字段，避免部分批次已经提交
+        for name, column in columns.items():
+            if column.dtype.kind == "f" and not getattr(model, name).null and np.isnan(column).any():
+                raise ValueError(f"{name}字段包含空值（NaN），该字段不能为空")
+
+        count: int = len(columns["datetime"])
+        inserted: int = 0
+        start: float = perf_counter()
+
+        for i in range(0, count, batch_size):
+            # 按列切片后一次性转换为Python对象，再按行组合
+            values: list[list] = [to_values(column[i:i + batch_size]) for column in columns.values()]
+            rows: list[tuple] = [constants + row for row in zip(*values, strict=True)]
+
+            with self.db.atomic():
+                dts: set[datetime] = set(values[0])
+                existing: int = model.select().where(condition & model.datetime.in_(list(dts))).count()
+                inserted += len(dts) - existing
+
+                if load_data:
+                    self._load_data_infile(model, names, rows, update_columns)
+                else:
+                    model.insert_many(rows, fields=fields).on_conflict(preserve=preserve).execute()
+
+        self.monitor.on_rows(count)
+
+        seconds: float = perf_counter() - start
+        return BulkSaveResult(count=count, inserted=inserted, seconds=seconds)
+
+    def _replace_rows(self, model: type[Model], data: list[dict]) -> int:
+        """使用REPLACE写入数据，返回新增的行数"""
+        count: int = 0
+
+        with self.db.atomic():
+            for c in chunked(self._storage_rows(data), 50):
+                affected: int = model.insert_many(c).on_conflict_replace().as_rowcount().execute()
+
+                # REPLACE对新插入的行计1，对先删除再插入的行计2
+                count += 2 * len(c) - affected
+
+        self.monitor.on_rows(len(data))
         return count
 
-    def delete_tick_data(
+    def _load_data_infile(
+        self,
+        model: type[Model],
+        columns: list[str],
+        rows: list[tuple],
+        update_columns: list[str]
+    ) -> None:
+        """通过LOAD DATA LOCAL INFILE将数据导入临时表，再合并到目标表"""
+        table: str = model._meta.table_name
+        staging: str = f"tmp_{table}"
+
+        # 在内存中生成CSV数据，空值使用MySQL的\N表示
+        buffer: io.StringIO = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            writer.writerow([to_csv_value(value) for value in row])
+
+        # PyMySQL只支持从文件路径读取本地数据，因此需要先落地到临时文件
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write(buffer.getvalue())
+            path: str = f.name
+
+        column_sql: str = ", ".join(f"`{name}`" for name in columns)
+        update_sql: str = ", ".join(f"`{name}` = VALUES(`{name}`)" for name in update_columns)
+
+        # 临时表不支持分区，分区表只复制字段定义
+        if model in self.partitioned:
+            create_sql: str = f"CREATE TEMPORARY TABLE IF NOT EXISTS `{staging}` SELECT * FROM `{table}` LIMIT 0"
+        else:
+            create_sql = f"CREATE TEMPORARY TABLE IF NOT EXISTS `{staging}` LIKE `{table}`"
+
+        try:
+            self.db.execute_sql(create_sql)
+            self.db.execute_sql(f"TRUNCATE TABLE `{staging}`")
+            self.db.execute_sql(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE `{staging}` CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                f"LINES TERMINATED BY '\\n' ({column_sql})",
+                (path.replace("\\", "/"),)
+            )
+            self.db.execute_sql(
+                f"INSERT INTO `{table}` ({column_sql}) SELECT {column_sql} FROM `{staging}` "
+                f"ON DUPLICATE KEY UPDATE {update_sql}"
+            )
+        finally:
+            os.remove(path)
+
+    def _update_bar_overview(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        count: int
+    ) -> None:
+        """按本次写入的增量更新K线汇总数据"""
+        DbBarOverview.insert(
+            symbol=symbol,
+            exchange=exchange.value,
+            interval=interval.value,
+            count=count,
+            start=start,
+            end=end
+        ).on_conflict(
+            update={
+                DbBarOverview.count: DbBarOverview.count + fn.VALUES(DbBarOverview.count),
+                DbBarOverview.start: fn.LEAST(DbBarOverview.start, fn.VALUES(DbBarOverview.start)),
+                DbBarOverview.end: fn.GREATEST(DbBarOverview.end, fn.VALUES(DbBarOverview.end)),
+            }
+        ).execute()
+
+    def _update_tick_overview(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        count: int
+    ) -> None:
+        """按本次写入的增量更新Tick汇总数据"""
+        self._update_tick_overviews([{
+            "symbol": symbol,
+            "exchange": exchange.value,
+            "count": count,
+            "start": start,
+            "end": end
+        }])
+
+    def _update_tick_overviews(self, data: list[dict]) -> None:
+        """批量按增量更新多个合约的Tick汇总数据"""
+        DbTickOverview.insert_many(data).on_conflict(
+            update={
+                DbTickOverview.count: DbTickOverview.count + fn.VALUES(DbTickOverview.count),
+                DbTickOverview.start: fn.LEAST(DbTickOverview.start, fn.VALUES(DbTickOverview.start)),
+                DbTickOverview.end: fn.GREATEST(DbTickOverview.end, fn.VALUES(DbTickOverview.end)),
+            }
+        ).execute()
+
+    @connection_scope
+    def repair_bar_overview(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> None:
+        """全量统计K线数据，修复对应的汇总信息"""
+        data: tuple = (
+            self.bar_model.select(
+                fn.COUNT(SQL("*")),
+                fn.MIN(self.bar_model.datetime),
+                fn.MAX(self.bar_model.datetime)
+            ).where(
+                self._bar_filter(symbol, exchange, interval)
+            ).tuples().get()
+        )
+        count, start, end = data
+
+        if not count:
+            DbBarOverview.delete().where(
+                (DbBarOverview.symbol == symbol)
+                & (DbBarOverview.exchange == exchange.value)
+                & (DbBarOverview.interval == interval.value)
+            ).execute()
+            return
+
+        DbBarOverview.insert(
+            symbol=symbol,
+            exchange=exchange.value,
+            interval=interval.value,
+            count=count,
+            start=start,
+            end=end
+        ).on_conflict(
+            preserve=[DbBarOverview.count, DbBarOverview.start, DbBarOverview.end]
+        ).execute()
+
+    @connection_scope
+    def repair_tick_overview(
         self,
         symbol: str,
         exchange: Exchange
+    ) -> None:
+        """全量统计Tick数据，修复对应的汇总信息"""
+        data: tuple = (
+            self.tick_model.select(
+                fn.COUNT(SQL("*")),
+                fn.MIN(self.tick_model.datetime),
+                fn.MAX(self.tick_model.datetime)
+            ).where(
+                self._tick_filter(symbol, exchange)
+            ).tuples().get()
+        )
+        count, start, end = data
+
+        if not count:
+            DbTickOverview.delete().where(
+                (DbTickOverview.symbol == symbol)
+                & (DbTickOverview.exchange == exchange.value)
+            ).execute()
+            return
+
+        DbTickOverview.insert(
+            symbol=symbol,
+            exchange=exchange.value,
+            count=count,
+            start=start,
+            end=end
+        ).on_conflict(
+            preserve=[DbTickOverview.count, DbTickOverview.start, DbTickOverview.end]
+        ).execute()
+
+    @connection_scope
+    def add_bar_coverage(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> None:
+        """
+        记录已下载的K线数据区间。
+
+        保存数据时会自动记录数据的起止范围，下载器可以在下载完成后记录请求的完整区间，
+        以免区间首尾或休市期间没有数据的部分被视为缺失。数据序列还没有覆盖记录时，
+        先根据已有数据生成（需要MySQL 8.0及以上版本）。
+        """
+        if not DbBarCoverage.select().where(self._coverage_filter(symbol, exchange, interval)).exists():
+            self._init_bar_coverage(symbol, exchange, interval)
+
+        self._add_bar_coverage(symbol, exchange, interval, to_naive(start), to_naive(end), True)
+
+    @connection_scope
+    def get_missing_ranges(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        """
+        查询[start, end]范围内尚未覆盖的K线数据区间，按时间顺序返回。
+
+        缺失区间的端点取相邻已覆盖区间的边界，补充下载时会重复写入边界上的K线。
+        """
+        start = to_naive(start)
+        end = to_naive(end)
+
+        condition: Expression = self._coverage_filter(symbol, exchange, interval)
+        if not DbBarCoverage.select().where(condition).exists():
+            self._init_bar_coverage(symbol, exchange, interval)
+
+        s: ModelSelect = (
+            DbBarCoverage.select(DbBarCoverage.start, DbBarCoverage.end)
+            .where(condition & (DbBarCoverage.end >= start) & (DbBarCoverage.start <= end))
+            .order_by(DbBarCoverage.start)
+        )
+
+        ranges: list[tuple[datetime, datetime]] = []
+        cursor: datetime = start
+
+        for range_start, range_end in s.tuples():
+            if range_start > cursor:
+                ranges.append((cursor, range_start))
+            cursor = max(cursor, range_end)
+
+        if cursor < end:
+            ranges.append((cursor, end))
+
+        return ranges
+
+    @connection_scope
+    def init_bar_coverage(self, workers: int = 1) -> None:
+        """根据已有K线数据重建全部数据序列的覆盖区间，workers大于1时并行执行"""
+        series: list[tuple[str, Exchange, Interval]] = [
+            (overview.symbol, Exchange(overview.exchange), Interval(overview.interval))
+            for overview in DbBarOverview.select()
+        ]
+
+        def init(item: tuple[str, Exchange, Interval]) -> None:
+            self._init_bar_coverage(*item)
+
+        if workers > 1:
+            self._map_parallel(init, series, workers)
+        else:
+            for item in series:
+                init(item)
+
+    def _coverage_filter(self, symbol: str, exchange: Exchange, interval: Interval) -> Expression:
+        """生成覆盖区间的查询条件"""
+        return (
+            (DbBarCoverage.symbol == symbol)
+            & (DbBarCoverage.exchange == exchange.value)
+            & (DbBarCoverage.interval == interval.value)
+        )
+
+    def _init_bar_coverage(self, symbol: str, exchange: Exchange, interval: Interval) -> None:
+        """使用窗口函数在数据库端按K线间隔切分连续区间，重建数据序列的覆盖区间"""
+        model: type[Model] = self.bar_model
+        gap: timedelta = COVERAGE_GAPS.get(interval, DEFAULT_COVERAGE_GAP)
+
+        # 按时间顺序计算与上一根K线的间隔，超过阈值时开始新的区间
+        a: Select = (
+            model.select(
+                model.datetime.alias("dt"),
+                fn.LAG(model.datetime).over(order_by=[model.datetime]).alias("prev")
+            ).where(
+                self._bar_filter(symbol, exchange, interval)
+            )
+        ).alias("a")
+
+        flag: Node = Case(
+            None,
+            [(fn.TIMESTAMPDIFF(SQL("SECOND"), a.c.prev, a.c.dt) <= int(gap.total_seconds()), 0)],
+            1
+        )
+
+        b: Select = Select(
+            from_list=[a],
+            columns=[a.c.dt, fn.SUM(flag).over(order_by=[a.c.dt]).alias("grp")]
+        ).alias("b")
+
+        s: Select = (
+            Select(from_list=[b], columns=[fn.MIN(b.c.dt), fn.MAX(b.c.dt)])
+            .group_by(b.c.grp)
+            .order_by(fn.MIN(b.c.dt))
+        )
+
+        data: list[dict] = [
+            {
+                "symbol": symbol,
+                "exchange": exchange.value,
+                "interval": interval.value,
+                "start": start,
+                "end": end
+            }
+            for start, end in self._fetch_rows(s)
+        ]
+
+        with self.db.atomic():
+            DbBarCoverage.delete().where(self._coverage_filter(symbol, exchange, interval)).execute()
+
+            for c in chunked(data, 500):
+                DbBarCoverage.insert_many(c).execute()
+
+    def _add_bar_coverage(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        create: bool = False
+    ) -> None:
+        """
+        将区间合并到覆盖区间中，只合并重叠或首尾相接（相距不超过一根K线）的区间。
+
+        数据序列还没有覆盖记录时，create为False则跳过，留待首次查询缺失区间时根据已有数据生成。
+        """
+        condition: Expression = self._coverage_filter(symbol, exchange, interval)
+        delta: timedelta = INTERVAL_DELTAS.get(interval, timedelta(0))
+
+        with self.db.atomic():
+            ranges: list[DbBarCoverage] = list(
+                DbBarCoverage.select().where(
+                    condition
+                    & (DbBarCoverage.start <= end + delta)
+                    & (DbBarCoverage.end >= start - delta)
+                )
+            )
+
+            if not ranges and not create and not DbBarCoverage.select().where(condition).exists():
+                return
+
+            if ranges:
+                start = min(start, *[r.start for r in ranges])
+                end = max(end, *[r.end for r in ranges])
+                DbBarCoverage.delete().where(DbBarCoverage.id.in_([r.id for r in ranges])).execute()
+
+            DbBarCoverage.insert(
+                symbol=symbol,
+                exchange=exchange.value,
+                interval=interval.value,
+                start=start,
+                end=end
+            ).execute()
+
+    def _remove_bar_coverage(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> None:
+        """从覆盖区间中移除[start, end]范围，为None时不限制该端"""
+        condition: Expression = self._coverage_filter(symbol, exchange, interval)
+
+        if start is None and end is None:
+            DbBarCoverage.delete().where(condition).execute()
+            return
+
+        if start:
+            condition &= DbBarCoverage.end >= start
+        if end:
+            condition &= DbBarCoverage.start <= end
+
+        with self.db.atomic():
+            for r in DbBarCoverage.select().where(condition):
+                r.delete_instance()
+
+                # 保留移除范围两侧剩余的部分
+                if start and r.start < start:
+                    DbBarCoverage.create(
+                        symbol=symbol,
+                        exchange=exchange.value,
+                        interval=interval.value,
+                        start=r.start,
+                        end=start - timedelta(seconds=1)
+                    )
+                if end and r.end > end:
+                    DbBarCoverage.create(
+                        symbol=symbol,
+                        exchange=exchange.value,
+                        interval=interval.value,
+                        start=end + timedelta(seconds=1),
+                        end=r.end
+                    )
+
+    @replica_scope
+    @connection_scope
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        workers: int = 1
+    ) -> list[BarData]:
+        """
+        读取K线数据。
+
+        workers大于1且未开启文件缓存时，按汇总信息估算的行数将时间范围切分为多段，
+        使用多个数据库连接并行查询和转换后按顺序合并。
+        """
+        # 优先从内存缓存读取
+        series: tuple = ("bar", symbol, exchange.value, interval.value)
+        if self.cache:
+            cached: list | None = self.cache.get(series, to_naive(start), to_naive(end))
+            if cached is not None:
+                return cached
+            version: int = self.cache.version
+
+        def convert(row: tuple) -> BarData:
+            return self._to_bar(row, symbol, exchange, interval)
+
+        if self.file_cache:
+            rows: list[tuple] = self._load_bar_array(symbol, exchange, interval, start, end).tolist()
+            bars: list[BarData] = [convert(row) for row in rows]
+        elif workers > 1:
+            overview: DbBarOverview | None = DbBarOverview.get_or_none(
+                DbBarOverview.symbol == symbol,
+                DbBarOverview.exchange == exchange.value,
+                DbBarOverview.interval == interval.value
+            )
+
+            def select(begin: datetime, finish: datetime) -> ModelSelect:
+                return self._select_bar_data(symbol, exchange, interval, begin, finish)
+
+            rows, bars = self._load_parallel(start, end, workers, overview, select, convert)
+        else:
+            s: ModelSelect = self._select_bar_data(symbol, exchange, interval, start, end)
+            rows = self._fetch_rows(s)
+            bars = [convert(row) for row in rows]
+
+        if self.cache:
+            keys: list[datetime] = [row[0] for row in rows]
+            self.cache.put(series, to_naive(start), to_naive(end), keys, bars, version)
+
+        return bars
+
+    @replica_scope
+    @connection_scope
+    def load_resampled_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        window: int,
+        window_interval: Interval | None = None,
+        daily_end: time | None = None
+    ) -> list[BarData]:
+        """
+        在数据库端将interval周期的K线合成为window个window_interval周期的K线。
+
+        分钟和小时窗口按整点对齐，日线窗口按日期划分。daily_end为收盘时间，晚于该时间的K线（夜盘）归入下一个工作日，
+        周五夜盘归入下周一。由于没有交易日历，节假日前一天的夜盘仍归入节假日当天，会单独合成一根日线。
+        合成K线的时间戳为窗口内第一根K线的时间，开盘价和持仓量分别取窗口内第一根和最后一根K线。
+        """
+        window_interval = window_interval or interval
+        model: type[Model] = self.bar_model
+
+        # 计算每根K线所属的窗口编号
+        if window_interval == Interval.MINUTE:
+            bucket: Node = fn.FLOOR(fn.TIMESTAMPDIFF(SQL("MINUTE"), "1970-01-01 00:00:00", model.datetime) / window)
+        elif window_interval == Interval.HOUR:
+            bucket = fn.FLOOR(fn.TIMESTAMPDIFF(SQL("HOUR"), "1970-01-01 00:00:00", model.datetime) / window)
+        elif window_interval == Interval.DAILY:
+            dt: Node = model.datetime
+            if daily_end:
+                shift: int = 86400 - (daily_end.hour * 3600 + daily_end.minute * 60 + daily_end.second)
+                dt = fn.TIMESTAMPADD(SQL("SECOND"), shift, dt)
+
+            days: Node = fn.TO_DAYS(dt)
+            if daily_end:
+                # 顺延到周六和周日的K线归入下周一
+                days = days + Case(fn.WEEKDAY(dt), [(5, 2), (6, 1)], 0)
+            bucket = fn.FLOOR(days / window)
+        else:
+            raise ValueError(f"不支持合成的K线周期：{window_interval}")
+
+        # 在索引范围内分组统计，只返回每个窗口的聚合结果
+        g: ModelSelect = (
+            model.select(
+                fn.MIN(model.datetime).alias("first"),
+                fn.MAX(model.datetime).alias("last"),
+                fn.SUM(model.volume).alias("volume"),
+                fn.SUM(model.turnover).alias("turnover"),
+                fn.MAX(model.high_price).alias("high_price"),
+                fn.MIN(model.low_price).alias("low_price")
+            ).where(
+                self._bar_filter(symbol, exchange, interval)
+                & (model.datetime >= start)
+                & (model.datetime <= end)
+            ).group_by(bucket)
+        ).alias("g")
+
+        # 通过唯一索引关联窗口内的第一根和最后一根K线，读取开盘价、收盘价和持仓量
+        first: ModelAlias = model.alias("o")
+        last: ModelAlias = model.alias("c")
+
+        s: ModelSelect = (
+            first.select(
+                g.c.first,
+                g.c.volume,
+                g.c.turnover,
+                last.open_interest,
+                first.open_price,
+                g.c.high_price,
+                g.c.low_price,
+                last.close_price
+            ).join(
+                g,
+                on=(first.datetime == g.c.first)
+            ).join_from(
+                g,
+                last,
+                on=(last.datetime == g.c.last)
+            ).where(
+                self._bar_filter(symbol, exchange, interval, first)
+                & self._bar_filter(symbol, exchange, interval, last)
+            ).order_by(g.c.first)
+        )
+
+        rows: list[tuple] = self._fetch_rows(s)
+        return [self._to_bar(row, symbol, exchange, window_interval) for row in rows]
+
+    @replica_scope
+    @connection_scope
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        workers: int = 1
+    ) -> list[TickData]:
+        """
+        读取TICK数据。
+
+        workers大于1且未开启文件缓存时，按汇总信息估算的行数将时间范围切分为多段，
+        使用多个数据库连接并行查询和转换后按顺序合并。
+        """
+        # 优先从内存缓存读取
+        series: tuple = ("tick", symbol, exchange.value)
+        if self.cache:
+            cached: list | None = self.cache.get(series, to_naive(start), to_naive(end))
+            if cached is not None:
+                return cached
+            version: int = self.cache.version
+
+        def convert(row: tuple) -> TickData:
+            return self._to_tick(row, symbol, exchange)
+
+        if self.file_cache:
+            # 数组中不包含合约名称，调整为与数据库查询结果相同的字段顺序
+            name: str = self._get_tick_name(symbol, exchange)
+            rows: list[tuple] = [
+                (row[0], name, row[-1], *row[1:-1])
+                for row in self._load_tick_array(symbol, exchange, start, end).tolist()
+            ]
+            ticks: list[TickData] = [convert(row) for row in rows]
+        elif workers > 1:
+            overview: DbTickOverview | None = DbTickOverview.get_or_none(
+                DbTickOverview.symbol == symbol,
+                DbTickOverview.exchange == exchange.value
+            )
+
+            def select(begin: datetime, finish: datetime) -> ModelSelect:
+                return self._select_tick_data(symbol, exchange, begin, finish)
+
+            rows, ticks = self._load_parallel(start, end, workers, overview, select, convert)
+        else:
+            s: ModelSelect = self._select_tick_data(symbol, exchange, start, end)
+            rows = self._fetch_rows(s)
+            ticks = [convert(row) for row in rows]
+
+        if self.cache:
+            keys: list[datetime] = [row[0] for row in rows]
+            self.cache.put(series, to_naive(start), to_naive(end), keys, ticks, version)
+
+        return ticks
+
+    def _load_parallel(
+        self,
+        start: datetime,
+        end: datetime,
+        workers: int,
+        overview: Model | None,
+        select: Callable[[datetime, datetime], ModelSelect],
+        convert: Callable[[tuple], Any]
+    ) -> tuple[list[tuple], list]:
+        """
+        将时间范围切分为多段并行查询和转换，返回按时间顺序合并的查询结果和转换后的数据。
+
+        根据汇总信息按时间比例估算范围内的行数，每段约SLICE_ROWS行且不少于workers段，
+        没有汇总信息时按workers平均切分。
+        """
+        start = to_naive(start)
+        end = to_naive(end)
+
+        count: int = workers
+        if overview and overview.end > overview.start:
+            overlap: timedelta = min(end, overview.end) - max(start, overview.start)
+            estimate: float = overview.count * max(overlap / (overview.end - overview.start), 0)
+            count = max(workers, ceil(estimate / SLICE_ROWS))
+
+        def load(item: tuple[datetime, datetime]) -> tuple[list[tuple], list]:
+            part: list[tuple] = self._fetch_rows(select(*item))
+            return part, [convert(row) for row in part]
+
+        results: list[tuple[list[tuple], list]] = self._map_parallel(
+            load,
+            split_range(start, end, count),
+            workers
+        )
+
+        rows: list[tuple] = []
+        data: list = []
+        for part, converted in results:
+            rows.extend(part)
+            data.extend(converted)
+        return rows, data
+
+    def _select_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime | None,
+        end: datetime | None
+    ) -> ModelSelect:
+        """生成K线数据查询，返回时间戳和数值字段，start和end为None时不限制"""
+        model: type[Model] = self.bar_model
+
+        s: ModelSelect = (
+            model.select(
+                model.datetime,
+                *[getattr(model, name) for name in BAR_COLUMNS]
+            ).where(
+                self._bar_filter(symbol, exchange, interval)
+            ).order_by(model.datetime)
+        )
+
+        if start:
+            s = s.where(model.datetime >= start)
+        if end:
+            s = s.where(model.datetime <= end)
+        return s
+
+    def _select_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime | None,
+        end: datetime | None
+    ) -> ModelSelect:
+        """生成TICK数据查询，返回时间戳、名称、本地时间和数值字段，start和end为None时不限制"""
+        model: type[Model] = self.tick_model
+
+        # 紧凑格式下合约名称保存在合约代码映射表中
+        if self.compact:
+            instrument: DbInstrument | None = self._get_instrument(symbol, exchange.value)
+            name_field: Node = Value(instrument.name if instrument else "")
+        else:
+            name_field = DbTickData.name
+
+        s: ModelSelect = (
+            model.select(
+                model.datetime,
+                name_field,
+                model.localtime,
+                *[getattr(model, name) for name in TICK_COLUMNS]
+            ).where(
+                self._tick_filter(symbol, exchange)
+            ).order_by(model.datetime)
+        )
+
+        if start:
+            s = s.where(model.datetime >= start)
+        if end:
+            s = s.where(model.datetime <= end)
+        return s
+
+    @replica_scope
+    @connection_scope
+    def load_bar_data_last_n(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        n: int,
+        end: datetime | None = None
+    ) -> list[BarData]:
+        """
+        读取截至end的最近n根K线，按时间升序返回，end为None时读取最新数据。
+
+        沿唯一索引倒序扫描并限制行数，只读取需要的数据，适用于策略初始化。
+        """
+        model: type[Model] = self.bar_model
+
+        s: ModelSelect = (
+            self._select_bar_data(symbol, exchange, interval, None, end)
+            .order_by(model.datetime.desc())
+            .limit(n)
+        )
+
+        rows: list[tuple] = self._fetch_rows(s)
+        rows.reverse()
+
+        return [self._to_bar(row, symbol, exchange, interval) for row in rows]
+
+    @replica_scope
+    @connection_scope
+    def load_tick_data_last_n(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        n: int,
+        end: datetime | None = None
+    ) -> list[TickData]:
+        """读取截至end的最近n个TICK，按时间升序返回，end为None时读取最新数据"""
+        model: type[Model] = self.tick_model
+
+        s: ModelSelect = (
+            self._select_tick_data(symbol, exchange, None, end)
+            .order_by(model.datetime.desc())
+            .limit(n)
+        )
+
+        rows: list[tuple] = self._fetch_rows(s)
+        rows.reverse()
+
+        return [self._to_tick(row, symbol, exchange) for row in rows]
+
+    def _to_bar(self, row: tuple, symbol: str, exchange: Exchange, interval: Interval) -> BarData:
+        """将查询结果转换为BarData"""
+        bar: BarData = BarData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=datetime.fromtimestamp(row[0].timestamp(), DB_TZ),
+            interval=interval,
+            gateway_name="DB",
+            **dict(zip(BAR_COLUMNS, row[1:], strict=True))
+        )
+        return bar
+
+    def _to_tick(self, row: tuple, symbol: str, exchange: Exchange) -> TickData:
+        """将查询结果转换为TickData"""
+        tick: TickData = TickData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=datetime.fromtimestamp(row[0].timestamp(), DB_TZ),
+            name=row[1],
+            localtime=row[2],
+            gateway_name="DB",
+            **dict(zip(TICK_COLUMNS, row[3:], strict=True))
+        )
+        return tick
+
+    @replica_scope
+    @connection_scope
+    def load_bar_data_multi(
+        self,
+        vt_symbols: list[str],
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        workers: int = 1
+    ) -> dict[str, list[BarData]]:
+        """
+        读取多个合约的K线数据，返回以vt_symbol为键的字典。
+
+        合约按交易所分组，每组使用IN查询批量读取，workers大于1时并行执行多个查询。
+        """
+        groups: dict[Exchange, list[str]] = defaultdict(list)
+        for vt_symbol in vt_symbols:
+            symbol, exchange = extract_vt_symbol(vt_symbol)
+            groups[exchange].append(symbol)
+
+        tasks: list[tuple[Exchange, list[str]]] = [
+            (exchange, c)
+            for exchange, symbols in groups.items()
+            for c in chunked(symbols, 100)
+        ]
+
+        def load(task: tuple[Exchange, list[str]]) -> list[BarData]:
+            exchange, symbols = task
+            return self._load_bar_data_multi(symbols, exchange, interval, start, end)
+
+        if workers > 1:
+            results: list[list[BarData]] = self._map_parallel(load, tasks, workers)
+        else:
+            results = [load(task) for task in tasks]
+
+        data: dict[str, list[BarData]] = {vt_symbol: [] for vt_symbol in vt_symbols}
+        for bars in results:
+            for bar in bars:
+                data.setdefault(bar.vt_symbol, []).append(bar)
+
+        return data
+
+    def _load_bar_data_multi(
+        self,
+        symbols: list[str],
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> list[BarData]:
+        """使用一次IN查询读取同一交易所下多个合约的K线数据"""
+        model: type[Model] = self.bar_model
+
+        # 紧凑格式下按合约编号查询，再映射回合约代码
+        if self.compact:
+            names: dict = {}
+            for symbol in symbols:
+                instrument: DbInstrument | None = self._get_instrument(symbol, exchange.value)
+                if instrument:
+                    names[instrument.id] = instrument.symbol
+
+            key: Field = DbBarDataCompact.instrument_id
+            condition: Expression = key.in_(list(names))
+        else:
+            names = {symbol: symbol for symbol in symbols}
+
+            key = DbBarData.symbol
+            condition = key.in_(symbols) & (DbBarData.exchange == exchange.value)
+
+        if not names:
+            return []
+
+        s: ModelSelect = (
+            model.select(
+                key,
+                model.datetime,
+                *[getattr(model, name) for name in BAR_COLUMNS]
+            ).where(
+                condition
+                & (model.interval == interval.value)
+                & (model.datetime >= start)
+                & (model.datetime <= end)
+            ).order_by(key, model.datetime)
+        )
+
+        bars: list[BarData] = []
+        for row in self._fetch_rows(s):
+            bar: BarData = self._to_bar(row[1:], names.get(row[0], row[0]), exchange, interval)
+            bars.append(bar)
+
+        return bars
+
+    @replica_scope
+    @connection_scope
+    def load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """读取K线数据，返回BAR_DTYPE类型的结构化数组"""
+        return self._load_bar_array(symbol, exchange, interval, start, end)
+
+    @replica_scope
+    @connection_scope
+    def load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """读取TICK数据，返回TICK_DTYPE类型的结构化数组"""
+        return self._load_tick_array(symbol, exchange, start, end)
+
+    def _select_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """从数据库读取K线数据的结构化数组"""
+        model: type[Model] = self.bar_model
+
+        s: ModelSelect = (
+            model.select(
+                to_timestamp(model.datetime),
+                *[getattr(model, name) for name in BAR_COLUMNS]
+            ).where(
+                self._bar_filter(symbol, exchange, interval)
+                & (model.datetime >= start)
+                & (model.datetime <= end)
+            ).order_by(model.datetime)
+        )
+
+        # 跳过模型对象构建，直接读取游标中的原始元组
+        rows: list[tuple] = self._fetch_rows(s)
+        return rows_to_array(rows, BAR_DTYPE)
+
+    def _select_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """从数据库读取TICK数据的结构化数组"""
+        model: type[Model] = self.tick_model
+
+        s: ModelSelect = (
+            model.select(
+                to_timestamp(model.datetime),
+                *[getattr(model, name) for name in TICK_COLUMNS],
+                fn.IFNULL(to_timestamp(model.localtime), NAT_VALUE)
+            ).where(
+                self._tick_filter(symbol, exchange)
+                & (model.datetime >= start)
+                & (model.datetime <= end)
+            ).order_by(model.datetime)
+        )
+
+        rows: list[tuple] = self._fetch_rows(s)
+        return rows_to_array(rows, TICK_DTYPE)
+
+    def _load_bar_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """读取K线数据的结构化数组，开启文件缓存时优先读取本地文件"""
+        overview: DbBarOverview | None = None
+        if self.file_cache:
+            overview = DbBarOverview.get_or_none(
+                DbBarOverview.symbol == symbol,
+                DbBarOverview.exchange == exchange.value,
+                DbBarOverview.interval == interval.value
+            )
+
+        def select(begin: datetime, finish: datetime) -> np.ndarray:
+            return self._select_bar_array(symbol, exchange, interval, begin, finish)
+
+        return self._load_array(
+            ("bar", symbol, exchange.value, interval.value),
+            start,
+            end,
+            (overview.start, overview.end) if overview else None,
+            select
+        )
+
+    def _load_tick_array(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> np.ndarray:
+        """读取TICK数据的结构化数组，开启文件缓存时优先读取本地文件"""
+        overview: DbTickOverview | None = None
+        if self.file_cache:
+            overview = DbTickOverview.get_or_none(
+                DbTickOverview.symbol == symbol,
+                DbTickOverview.exchange == exchange.value
+            )
+
+        def select(begin: datetime, finish: datetime) -> np.ndarray:
+            return self._select_tick_array(symbol, exchange, begin, finish)
+
+        return self._load_array(
+            ("tick", symbol, exchange.value),
+            start,
+            end,
+            (overview.start, overview.end) if overview else None,
+            select
+        )
+
+    def _load_array(
+        self,
+        series: tuple,
+        start: datetime,
+        end: datetime,
+        bounds: tuple[datetime, datetime] | None,
+        select: Callable[[datetime, datetime], np.ndarray]
+    ) -> np.ndarray:
+        """
+        读取结构化数组，已收盘交易日的数据从文件缓存读取，缺失的交易日按日从数据库读取后写入缓存。
+
+        bounds为汇总信息中的数据起止时间，只缓存该范围内的交易日，其余部分和当日数据直接查询数据库。
+        """
+        start = to_naive(start)
+        end = to_naive(end)
+
+        if not self.file_cache or not bounds:
+            return select(start, end)
+
+        today: date = datetime.now(DB_TZ).date()
+        first_day: date = max(start.date(), bounds[0].date())
+        last_day: date = min(end.date(), bounds[1].date(), today - timedelta(days=1))
+
+        if first_day > last_day:
+            return select(start, end)
+
+        cache_start: datetime = datetime.combine(first_day, time())
+        cache_end: datetime = datetime.combine(last_day + timedelta(days=1), time())
+
+        parts: list[np.ndarray] = []
+        if start < cache_start:
+            parts.append(select(start, cache_start - timedelta(microseconds=1)))
+
+        # 连续缺失的交易日合并为一次查询
+        missing: list[date] = []
+        day: date = first_day
+
+        while day <= last_day:
+            data: np.ndarray | None = self.file_cache.load(series, day)
+
+            if data is None:
+                missing.append(day)
+            else:
+                if missing:
+                    parts.extend(self._fill_file_cache(series, missing, select))
+                    missing = []
+                parts.append(data)
+
+            day += timedelta(days=1)
+
+        if missing:
+            parts.extend(self._fill_file_cache(series, missing, select))
+
+        if end >= cache_end:
+            parts.append(select(cache_end, end))
+
+        # 首尾交易日的缓存数据可能超出查询范围
+        result: np.ndarray = np.concatenate(parts)
+        dts: np.ndarray = result["datetime"]
+        return result[(dts >= np.datetime64(start, "us")) & (dts <= np.datetime64(end, "us"))]
+
+    def _fill_file_cache(
+        self,
+        series: tuple,
+        days: list[date],
+        select: Callable[[datetime, datetime], np.ndarray]
+    ) -> list[np.ndarray]:
+        """从数据库读取连续多个交易日的数据，按日拆分后写入文件缓存"""
+        if not self.file_cache:
+            return []
+
+        version: int = self.file_cache.version
+
+        edges: list[datetime] = [datetime.combine(day, time()) for day in days]
+        edges.append(edges[-1] + timedelta(days=1))
+
+        data: np.ndarray = select(edges[0], edges[-1] - timedelta(microseconds=1))
+
+        indexes: np.ndarray = np.searchsorted(data["datetime"], np.array(edges, dtype="datetime64[us]"))
+
+        parts: list[np.ndarray] = []
+        for i, day in enumerate(days):
+            part: np.ndarray = data[indexes[i]:indexes[i + 1]]
+            self.file_cache.save(series, day, part, version)
+            parts.append(part)
+
+        return parts
+
+    def _get_tick_name(self, symbol: str, exchange: Exchange) -> str:
+        """查询合约名称，开启文件缓存时保存在缓存目录中"""
+        series: tuple = ("tick", symbol, exchange.value)
+
+        if self.file_cache:
+            name: str | None = self.file_cache.load_name(series)
+            if name is not None:
+                return name
+
+        if self.compact:
+            instrument: DbInstrument | None = self._get_instrument(symbol, exchange.value)
+            name = instrument.name if instrument else None
+        else:
+            name = (
+                DbTickData.select(DbTickData.name)
+                .where(self._tick_filter(symbol, exchange))
+                .order_by(DbTickData.datetime.desc())
+                .limit(1)
+                .scalar()
+            )
+
+        name = name or ""
+        if self.file_cache:
+            self.file_cache.save_name(series, name)
+        return name
+
+    @connection_scope
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000
+    ) -> Iterator[list[BarData]]:
+        """流式读取K线数据，按时间顺序逐批返回"""
+        s: ModelSelect = self._select_bar_data(symbol, exchange, interval, start, end)
+
+        for rows in self._iter_rows(s, batch_size):
+            yield [self._to_bar(row, symbol, exchange, interval) for row in rows]
+
+    @connection_scope
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000
+    ) -> Iterator[list[TickData]]:
+        """流式读取TICK数据，按时间顺序逐批返回"""
+        s: ModelSelect = self._select_tick_data(symbol, exchange, start, end)
+
+        for rows in self._iter_rows(s, batch_size):
+            yield [self._to_tick(row, symbol, exchange) for row in rows]
+
+    def _fetch_rows(self, query: Select) -> list[tuple]:
+        """执行查询并读取全部原始元组，开启监控时统计读取耗时和行数"""
+        cursor: Any = self.db.execute(query)
+
+        start: float = perf_counter()
+        rows: list[tuple] = cursor.fetchall()
+
+        if self.monitor.enabled:
+            self.monitor.on_fetch(perf_counter() - start, len(rows))
+        return rows
+
+    def _iter_rows(self, query: ModelSelect, batch_size: int) -> Iterator[list[tuple]]:
+        """
+        使用非缓冲的服务端游标执行查询，逐批返回原始元组。
+
+        非缓冲游标在读完结果前会占用所在的连接，因此单独建立一个不属于连接池的连接，
+        迭代过程中当前线程仍可以执行其他查询，迭代结束后关闭该连接。
+        """
+        sql, params = query.sql()
+
+        connection: Connection = Connection(
+            database=self.db.database,
+            autocommit=True,
+            **self.db.connect_params
+        )
+        try:
+            cursor: SSCursor = connection.cursor(SSCursor)
+            cursor.execute(sql, params)
+
+            while True:
+                rows: list[tuple] = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            # 直接关闭连接，提前退出时无需读完剩余结果
+            connection.close()
+
+    @connection_scope
+    def delete_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 10000,
+        pause: float = 0
+    ) -> int:
+        """
+        删除[start, end]范围内的K线数据，为None时不限制该端，返回删除的行数。
+
+        按时间顺序每次删除batch_size行并单独提交，每批之间暂停pause秒，避免长时间持有锁影响实时写入，
+        batch_size为0时使用一条语句删除。汇总信息按删除行数调整，没有剩余数据时才删除。
+        """
+        model: type[Model] = self.bar_model
+        condition: Expression = self._bar_filter(symbol, exchange, interval)
+
+        if start:
+            start = convert_tz(start)
+            condition &= model.datetime >= start
+        if end:
+            end = convert_tz(end)
+            condition &= model.datetime <= end
+
+        count: int = self._delete_rows(model, condition, batch_size, pause)
+
+        self._invalidate_cache(("bar", symbol, exchange.value, interval.value), start, end)
+        self._remove_bar_coverage(symbol, exchange, interval, start, end)
+        self._adjust_bar_overview(symbol, exchange, interval, count)
+
+        return count
+
+    @connection_scope
+    def delete_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 10000,
+        pause: float = 0
     ) -> int:
-        """删除TICK数据"""
-        d: ModelDelete = DbTickData.delete().where(
-            (DbTickData.symbol == symbol)
-            & (DbTickData.exchange == exchange.value)
+        """
+        删除[start, end]范围内的TICK数据，为None时不限制该端，返回删除的行数。
+
+        分批删除和汇总信息的处理方式与delete_bar_data相同。
+        """
+        model: type[Model] = self.tick_model
+        condition: Expression = self._tick_filter(symbol, exchange)
+
+        if start:
+            start = convert_tz(start)
+            condition &= model.datetime >= start
+        if end:
+            end = convert_tz(end)
+            condition &= model.datetime <= end
+
+        count: int = self._delete_rows(model, condition, batch_size, pause)
+
+        self._invalidate_cache(("tick", symbol, exchange.value), start, end)
+        self._adjust_tick_overview(symbol, exchange, count)
+
+        return count
+
+    def _delete_rows(self, model: type[Model], condition: Expression, batch_size: int, pause: float) -> int:
+        """
+        按时间顺序分批删除满足条件的数据，返回删除的行数。
+
+        每批沿唯一索引删除最早的batch_size行，在事务外执行时每批单独提交，删除行数不足一批时结束。
+        """
+        if not batch_size:
+            d: ModelDelete = model.delete().where(condition)
+            return int(d.execute())
+
+        count: int = 0
+
+        while True:
+            d = model.delete().where(condition).order_by(model.datetime).limit(batch_size)
+            deleted: int = d.execute()
+            count += deleted
+
+            if deleted < batch_size:
+                break
+
+            if pause:
+                sleep(pause)
+
+        return count
+
+    def _adjust_bar_overview(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        removed: int
+    ) -> tuple[datetime, datetime] | None:
+        """
+        删除部分数据后按删除行数调整K线汇总信息，并重新查询剩余数据的起止时间。
+
+        返回剩余数据的起止时间，没有剩余数据时删除汇总信息并返回None。
+        """
+        start, end = (
+            self.bar_model.select(
+                fn.MIN(self.bar_model.datetime),
+                fn.MAX(self.bar_model.datetime)
+            ).where(
+                self._bar_filter(symbol, exchange, interval)
+            ).tuples().get()
+        )
+
+        overview: Expression = (
+            (DbBarOverview.symbol == symbol)
+            & (DbBarOverview.exchange == exchange.value)
+            & (DbBarOverview.interval == interval.value)
         )
 
-        count: int = d.execute()
+        if start is None:
+            DbBarOverview.delete().where(overview).execute()
+            return None
+
+        # 结束时间在更新时重新查询，避免覆盖删除期间实时写入的数据
+        DbBarOverview.update(
+            count=DbBarOverview.count - removed,
+            start=start,
+            end=(
+                self.bar_model.select(fn.MAX(self.bar_model.datetime))
+                .where(self._bar_filter(symbol, exchange, interval))
+            )
+        ).where(overview).execute()
+        return start, end
+
+    def _adjust_tick_overview(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        removed: int
+    ) -> tuple[datetime, datetime] | None:
+        """删除部分数据后按删除行数调整Tick汇总信息，返回剩余数据的起止时间"""
+        start, end = (
+            self.tick_model.select(
+                fn.MIN(self.tick_model.datetime),
+                fn.MAX(self.tick_model.datetime)
+            ).where(
+                self._tick_filter(symbol, exchange)
+            ).tuples().get()
+        )
 
-        # 删除Tick汇总数据
-        d2: ModelDelete = DbTickOverview.delete().where(
+        overview: Expression = (
             (DbTickOverview.symbol == symbol)
             & (DbTickOverview.exchange == exchange.value)
         )
-        d2.execute()
+
+        if start is None:
+            DbTickOverview.delete().where(overview).execute()
+            return None
+
+        DbTickOverview.update(
+            count=DbTickOverview.count - removed,
+            start=start,
+            end=(
+                self.tick_model.select(fn.MAX(self.tick_model.datetime))
+                .where(self._tick_filter(symbol, exchange))
+            )
+        ).where(overview).execute()
+        return start, end
+
+    @connection_scope
+    def ensure_partitions(self) -> None:
+        """补充创建未来月份的分区，长期运行的进程可以定期调用"""
+        for model in self.partitioned:
+            self._ensure_partitions(model)
+
+    @connection_scope
+    def drop_bar_partitions(self, before: datetime) -> int:
+        """
+        删除早于指定时间的K线数据分区，返回删除的行数。
+
+        只删除整月都早于before的分区，需要开启database.partition_bar。
+        """
+        keys: list[str] = ["instrument_id"] if self.compact else ["symbol", "exchange"]
+        rows: list[tuple] = self._drop_partitions(self.bar_model, convert_tz(before), keys + ["interval"])
+
+        count: int = 0
+        for symbol, exchange, interval, removed in rows:
+            count += removed
+
+            exchange_: Exchange = Exchange(exchange)
+            interval_: Interval = Interval(interval)
+
+            remaining: tuple[datetime, datetime] | None = self._adjust_bar_overview(
+                symbol, exchange_, interval_, removed
+            )
+            if remaining is None:
+                self._remove_bar_coverage(symbol, exchange_, interval_)
+            else:
+                self._remove_bar_coverage(symbol, exchange_, interval_, None, remaining[0] - timedelta(seconds=1))
+
+        return count
+
+    @connection_scope
+    def drop_tick_partitions(self, before: datetime) -> int:
+        """
+        删除早于指定时间的TICK数据分区，返回删除的行数。
+
+        只删除整月都早于before的分区，需要开启database.partition_tick。
+        """
+        keys: list[str] = ["instrument_id"] if self.compact else ["symbol", "exchange"]
+        rows: list[tuple] = self._drop_partitions(self.tick_model, convert_tz(before), keys)
+
+        count: int = 0
+        for symbol, exchange, removed in rows:
+            count += removed
+            self._adjust_tick_overview(symbol, Exchange(exchange), removed)
+
         return count
 
+    @connection_scope
+    def migrate_compact_schema(self, chunk_size: int = 100000) -> int:
+        """
+        将原有格式的K线和TICK数据按主键区间分块迁移到紧凑格式数据表，返回写入的行数。
+
+        每个分块单独提交事务，先登记分块内的合约代码，再使用upsert写入，中断后可以重复执行。
+        返回值按MySQL的影响行数统计，首次迁移时等于迁移的行数，重复执行时未变化的数据不计入。
+        迁移完成后在全局配置中开启database.compact_schema，原有数据表需手动删除。
+        """
+        self.db.create_tables([DbInstrument, DbBarDataCompact, DbTickDataCompact])
+
+        tasks: list[tuple[type[Model], type[Model], list[str], list[str]]] = [
+            (DbBarData, DbBarDataCompact, ["interval", "datetime"], BAR_COLUMNS),
+            (DbTickData, DbTickDataCompact, ["datetime"], [*TICK_COLUMNS, "localtime"]),
+        ]
+
+        count: int = 0
+
+        for source, target, keys, columns in tasks:
+            first, last = source.select(fn.MIN(source.id), fn.MAX(source.id)).tuples().get()
+            if first is None:
+                continue
+
+            for begin in range(first, last + 1, chunk_size):
+                condition: Expression = source.id.between(begin, begin + chunk_size - 1)
+
+                s: ModelSelect = (
+                    source.select(
+                        DbInstrument.id,
+                        *[getattr(source, name) for name in keys + columns]
+                    ).join(
+                        DbInstrument,
+                        on=(
+                            (DbInstrument.symbol == source.symbol)
+                            & (DbInstrument.exchange == source.exchange)
+                        )
+                    ).where(condition)
+                )
+
+                with self.db.atomic():
+                    self._register_instruments(source, condition)
+
+                    count += target.insert_from(
+                        s,
+                        [target.instrument_id, *[getattr(target, name) for name in keys + columns]]
+                    ).on_conflict(
+                        preserve=[getattr(target, name) for name in columns]
+                    ).as_rowcount().execute()
+
+        return count
+
+    def _register_instruments(self, source: type[Model], condition: Expression) -> None:
+        """登记主键分块内出现的合约代码，合约名称取自TICK数据，已登记但没有名称时补充"""
+        if source is DbTickData:
+            DbInstrument.insert_from(
+                DbTickData.select(
+                    DbTickData.symbol,
+                    DbTickData.exchange,
+                    fn.MAX(DbTickData.name)
+                ).where(condition).group_by(DbTickData.symbol, DbTickData.exchange),
+                [DbInstrument.symbol, DbInstrument.exchange, DbInstrument.name]
+            ).on_conflict(
+                update={DbInstrument.name: fn.COALESCE(DbInstrument.name, fn.VALUES(DbInstrument.name))}
+            ).execute()
+        else:
+            DbInstrument.insert_from(
+                source.select(source.symbol, source.exchange).where(condition).distinct(),
+                [DbInstrument.symbol, DbInstrument.exchange]
+            ).on_conflict_ignore().execute()
+
+    @replica_scope
+    @connection_scope
     def get_bar_overview(self) -> list[BarOverview]:
         """查询数据库中的K线汇总信息"""
-        # 如果已有K线，但缺失汇总信息，则执行初始化
-        data_count: int = DbBarData.select().count()
-        overview_count: int = DbBarOverview.select().count()
-        if data_count and not overview_count:
-            self.init_bar_overview()
+        # 如果已有K线，但缺失汇总信息，则执行初始化（只检查是否存在，避免全表统计）
+        if not DbBarOverview.select().exists() and self.bar_model.select().exists():
+            # 初始化需要写入主库
+            with self.db.route(None):
+                self.init_bar_overview()
 
         s: ModelSelect = DbBarOverview.select()
         overviews: list[BarOverview] = []
@@ -485,6 +3172,8 @@ class MysqlDatabase(BaseDatabase):
             overviews.append(overview)
         return overviews
 
+    @replica_scope
+    @connection_scope
     def get_tick_overview(self) -> list[TickOverview]:
         """查询数据库中的Tick汇总信息"""
         s: ModelSelect = DbTickOverview.select()
@@ -494,55 +3183,100 @@ class MysqlDatabase(BaseDatabase):
             overviews.append(overview)
         return overviews
 
-    def init_bar_overview(self) -> None:
-        """初始化数据库中的K线汇总信息"""
-        s: ModelSelect = (
-            DbBarData.select(
-                DbBarData.symbol,
-                DbBarData.exchange,
-                DbBarData.interval,
-                fn.COUNT(DbBarData.id).alias("count")
-            ).group_by(
-                DbBarData.symbol,
-                DbBarData.exchange,
-                DbBarData.interval
-            )
-        )
+    @connection_scope
+    def init_bar_overview(self, workers: int = 1) -> None:
+        """
+        初始化数据库中的K线汇总信息。
 
-        for data in s:
-            overview: DbBarOverview = DbBarOverview()
-            overview.symbol = data.symbol
-            overview.exchange = data.exchange
-            overview.interval = data.interval
-            overview.count = data.count
+        workers大于1时按交易所拆分统计任务，使用多个数据库连接并行执行。
+        """
+        if workers <= 1:
+            self._init_bar_overview(None)
+            return
 
-            start_bar: DbBarData = (
-                DbBarData.select()
-                .where(
-                    (DbBarData.symbol == data.symbol)
-                    & (DbBarData.exchange == data.exchange)
-                    & (DbBarData.interval == data.interval)
+        if self.compact:
+            s: ModelSelect = DbInstrument.select(DbInstrument.exchange).distinct()
+        else:
+            s = DbBarData.select(DbBarData.exchange).distinct()
+        exchanges: list[str] = [exchange for (exchange,) in s.tuples()]
+
+        self._map_parallel(self._init_bar_overview, exchanges, workers)
+
+    def _map_parallel(self, func: Callable, items: list, workers: int) -> list:
+        """在线程池中并行执行任务，每个线程使用独立的数据库连接，结果按输入顺序返回"""
+        # 工作线程沿用调用线程的读写分离路由，并将耗时计入调用线程正在统计的调用
+        target: PeeweeMySQLDatabase | None = self.db.current()
+        metrics: CallMetrics | None = self.monitor.current()
+
+        def run(item: Any) -> Any:
+            # 执行完成后关闭连接，连接池模式下归还连接池
+            with self.monitor.attach(metrics), self.db.route(target), self.db.connection_context():
+                return func(item)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, items))
+
+    def _init_bar_overview(self, exchange: str | None) -> None:
+        """通过一次聚合查询统计K线汇总信息，并批量写入"""
+        if self.compact:
+            s: ModelSelect = (
+                DbBarDataCompact.select(
+                    DbInstrument.symbol,
+                    DbInstrument.exchange,
+                    DbBarDataCompact.interval,
+                    fn.COUNT(SQL("*")),
+                    fn.MIN(DbBarDataCompact.datetime),
+                    fn.MAX(DbBarDataCompact.datetime)
+                ).join(
+                    DbInstrument,
+                    on=(DbBarDataCompact.instrument_id == DbInstrument.id)
+                ).group_by(
+                    DbInstrument.id,
+                    DbInstrument.symbol,
+                    DbInstrument.exchange,
+                    DbBarDataCompact.interval
                 )
-                .order_by(Asc(DbBarData.datetime))
-                .first()
             )
-            overview.start = start_bar.datetime
-
-            end_bar: DbBarData = (
-                DbBarData.select()
-                .where(
-                    (DbBarData.symbol == data.symbol)
-                    & (DbBarData.exchange == data.exchange)
-                    & (DbBarData.interval == data.interval)
+            exchange_field: Field = DbInstrument.exchange
+        else:
+            s = (
+                DbBarData.select(
+                    DbBarData.symbol,
+                    DbBarData.exchange,
+                    DbBarData.interval,
+                    fn.COUNT(SQL("*")),
+                    fn.MIN(DbBarData.datetime),
+                    fn.MAX(DbBarData.datetime)
+                ).group_by(
+                    DbBarData.symbol,
+                    DbBarData.exchange,
+                    DbBarData.interval
                 )
-                .order_by(Desc(DbBarData.datetime))
-                .first()
             )
-            overview.end = end_bar.datetime
+            exchange_field = DbBarData.exchange
+
+        if exchange:
+            s = s.where(exchange_field == exchange)
+
+        data: list[dict] = []
+        for symbol, exchange_, interval, count, start, end in s.tuples():
+            data.append({
+                "symbol": symbol,
+                "exchange": exchange_,
+                "interval": interval,
+                "count": count,
+                "start": start,
+                "end": end
+            })
+
+        with self.db.atomic():
+            for c in chunked(data, 500):
+                DbBarOverview.insert_many(c).on_conflict(
+                    preserve=[DbBarOverview.count, DbBarOverview.start, DbBarOverview.end]
+                ).execute()
 
-            overview.save()
-    
     """nifx 20250621"""
+    @connection_scope
     def save_symbol_info(self, symbol_infos: list[DbSymbolInfo]) -> bool:
         """保存标的物信息"""
         if not symbol_infos:
@@ -583,9 +3317,91 @@ class MysqlDatabase(BaseDatabase):
         with self.db.atomic():
             for batch in chunked(data, 100):  # 每批100条
                 DbSymbolInfo.insert_many(batch).on_conflict_replace().execute()
-                
+
+        self.symbol_infos.stale = True
+        if self.router:
+            self.router.on_write()
         return True
 
+    @connection_scope
+    def sync_symbol_info(
+        self,
+        symbol_infos: list[DbSymbolInfo],
+        mark_delisted: bool = False,
+        delisted_date: datetime | None = None
+    ) -> dict[str, int]:
+        """
+        与数据库中的标的物信息逐条对比，只写入新增和内容有变化的数据，返回各类数据的数量。
+
+        mark_delisted为True时，对本次数据涉及的交易所中未出现且尚未退市的标的物设置退市日期，
+        delisted_date默认为当天。不会修改传入的对象。
+        """
+        fields: list[Field] = [field for field in DbSymbolInfo._meta.sorted_fields if field.name != "id"]
+
+        def normalize(d: dict) -> tuple:
+            # 按数据库字段类型统一取值，避免整数和浮点数等类型差异被视为变化
+            return tuple(
+                None if d[field.name] is None else field.python_value(field.db_value(d[field.name]))
+                for field in fields
+            )
+
+        existing: dict[tuple[str, str], dict] = {
+            (d["symbol"], d["exchange"]): d
+            for d in DbSymbolInfo.select(*fields).dicts()
+        }
+
+        result: dict[str, int] = {"inserted": 0, "updated": 0, "unchanged": 0, "delisted": 0}
+        data: list[dict] = []
+        keys: set[tuple[str, str]] = set()
+
+        for info in symbol_infos:
+            d: dict = {field.name: getattr(info, field.name) for field in fields}
+            for name in ["listed_date", "delisted_date", "conversion_start_date", "delisting_begin_date"]:
+                if d[name]:
+                    d[name] = convert_tz(d[name])
+
+            key: tuple[str, str] = (d["symbol"], d["exchange"])
+            keys.add(key)
+
+            old: dict | None = existing.get(key, None)
+            if not old:
+                result["inserted"] += 1
+            elif normalize(old) != normalize(d):
+                result["updated"] += 1
+            else:
+                result["unchanged"] += 1
+                continue
+
+            data.append(d)
+
+        if mark_delisted:
+            if delisted_date:
+                delisted_date = convert_tz(delisted_date)
+            else:
+                delisted_date = to_naive(datetime.now(DB_TZ)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+            exchanges: set[str] = {exchange for _, exchange in keys}
+
+            for key, old in existing.items():
+                if key in keys or key[1] not in exchanges or old["delisted_date"]:
+                    continue
+
+                data.append({**old, "delisted_date": delisted_date})
+                result["delisted"] += 1
+
+        # 使用REPLACE写入，变化的数据分配新的主键，内存索引可以增量刷新
+        with self.db.atomic():
+            for batch in chunked(data, 1000):
+                DbSymbolInfo.insert_many(batch).on_conflict_replace().execute()
+
+        if data:
+            self.symbol_infos.stale = True
+            if self.router:
+                self.router.on_write()
+        return result
+
+    @replica_scope
+    @connection_scope
     def load_symbol_info(
         self, 
         symbol: str | None = None,
@@ -632,6 +3448,7 @@ class MysqlDatabase(BaseDatabase):
             
         return result
 
+    @connection_scope
     def delete_symbol_info(
         self, 
         symbol: str, 
@@ -651,6 +3468,77 @@ class MysqlDatabase(BaseDatabase):
             
         if conditions:
             query = query.where(*conditions)
-            return query.execute()
-            
+            count: int = query.execute()
+            self.symbol_infos.stale = True
+            if self.router:
+                self.router.on_write()
+            return count
+
         return 0
+
+    def get_symbol_info(self, symbol: str, exchange: str) -> DbSymbolInfo | None:
+        """从内存索引中查询标的物信息"""
+        self._check_symbol_info()
+        info: DbSymbolInfo | None = self.symbol_infos.get(symbol, exchange)
+        return info
+
+    def get_symbol_infos_by_underlying(self, underlying_symbol: str) -> list[DbSymbolInfo]:
+        """从内存索引中查询标的资产对应的全部标的物，例如期权合约"""
+        self._check_symbol_info()
+        return self.symbol_infos.find("underlying_symbol", underlying_symbol)
+
+    def get_symbol_infos_by_type(self, sec_type1: int, sec_type2: int | None = None) -> list[DbSymbolInfo]:
+        """从内存索引中查询证券品种大类，以及可选的细类对应的全部标的物"""
+        self._check_symbol_info()
+        if sec_type2 is None:
+            return self.symbol_infos.find("sec_type1", sec_type1)
+        return self.symbol_infos.find("sec_type", (sec_type1, sec_type2))
+
+    def get_symbol_infos_by_board(self, board: int) -> list[DbSymbolInfo]:
+        """从内存索引中查询板块对应的全部标的物"""
+        self._check_symbol_info()
+        return self.symbol_infos.find("board", board)
+
+    def _check_symbol_info(self) -> None:
+        """首次查询或本进程写入数据后刷新内存索引"""
+        if self.symbol_infos.stale:
+            self.refresh_symbol_info()
+
+    @connection_scope
+    def refresh_symbol_info(self) -> None:
+        """
+        根据数据表的变化标记刷新标的物信息内存索引。
+
+        写入使用REPLACE，新增和修改的数据都会分配新的主键，因此只需读取主键大于上次最大值的数据，
+        出现删除导致行数不一致时全量重新加载。其他进程修改数据后可以调用该函数同步。
+        """
+        cache: SymbolInfoCache = self.symbol_infos
+
+        with cache.lock:
+            marker: tuple = DbSymbolInfo.select(
+                fn.COUNT(SQL("*")),
+                fn.MAX(DbSymbolInfo.id)
+            ).tuples().get()
+            count, last_id = marker
+
+            if marker != cache.marker:
+                previous_id: int | None = cache.marker[1] if cache.marker else None
+
+                if previous_id is None or last_id is None or last_id < previous_id:
+                    cache.clear()
+                    s: ModelSelect = DbSymbolInfo.select()
+                else:
+                    s = DbSymbolInfo.select().where(DbSymbolInfo.id > previous_id)
+
+                for info in s:
+                    cache.set(info)
+
+                # 行数不一致说明有数据被删除
+                if len(cache.infos) != count:
+                    cache.clear()
+                    for info in DbSymbolInfo.select():
+                        cache.set(info)
+
+                cache.marker = marker
+
+            cache.stale = False
@@ -0,0 +1,84 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Lock, local
+from time import monotonic
+from typing import Any
+
+from vnpy.trader.logger import logger
+
+
+class ReplicaRouter:
+    """
+    只读副本的轮询路由，连接失败的副本在retry_seconds秒内不再使用，之后重新尝试。
+
+    read_your_writes大于0时，线程写入数据后该秒数内的读取仍路由到主库，以读到自己的写入。
+    """
+
+    def __init__(self, replicas: list[Any], retry_seconds: float = 30, read_your_writes: float = 0) -> None:
+        """"""
+        self.replicas: list[Any] = replicas
+        self.retry_seconds: float = retry_seconds
+        self.read_your_writes: float = read_your_writes
+
+        self.index: int = 0
+        self.down_until: dict[int, float] = {}
+        self.lock: Lock = Lock()
+
+        self.local: local = local()
+
+    def choose(self) -> Any:
+        """轮询选择一个可用的只读副本，需要读取主库或没有可用副本时返回None"""
+        if getattr(self.local, "primary", 0):
+            return None
+
+        if self.read_your_writes:
+            write_time: float | None = getattr(self.local, "write_time", None)
+            if write_time is not None and monotonic() - write_time < self.read_your_writes:
+                return None
+
+        with self.lock:
+            now: float = monotonic()
+
+            for _ in range(len(self.replicas)):
+                i: int = self.index
+                self.index = (i + 1) % len(self.replicas)
+
+                if self.down_until.get(i, 0) <= now:
+                    return self.replicas[i]
+
+        return None
+
+    def mark_down(self, replica: Any, error: Exception) -> None:
+        """标记只读副本不可用"""
+        i: int = self.replicas.index(replica)
+
+        with self.lock:
+            self.down_until[i] = monotonic() + self.retry_seconds
+
+        logger.warning("只读副本{}连接失败，改用主库读取：{}", i, error)
+
+    def mark_up(self, replica: Any) -> None:
+        """标记只读副本恢复可用"""
+        i: int = self.replicas.index(replica)
+
+        with self.lock:
+            self.down_until.pop(i, None)
+
+    def is_up(self, replica: Any) -> bool:
+        """只读副本当前是否可用"""
+        i: int = self.replicas.index(replica)
+        return self.down_until.get(i, 0) <= monotonic()
+
+    def on_write(self) -> None:
+        """记录当前线程的写入时间"""
+        if self.read_your_writes:
+            self.local.write_time = monotonic()
+
+    @contextmanager
+    def use_primary(self) -> Iterator[None]:
+        """在当前线程内将读取固定路由到主库"""
+        self.local.primary = getattr(self.local, "primary", 0) + 1
+        try:
+            yield
+        finally:
+            self.local.primary -= 1
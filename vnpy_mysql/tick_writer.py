@@ -0,0 +1,133 @@
+from queue import Empty, Queue
+from threading import Event, Thread
+from time import monotonic, sleep
+
+from vnpy.trader.object import TickData
+from vnpy.trader.logger import logger
+
+from .mysql_database import MysqlDatabase
+
+
+class FlushRequest:
+    """刷新请求，写入完成后通知调用方"""
+
+    def __init__(self) -> None:
+        """"""
+        self.event: Event = Event()
+        self.result: bool = False
+
+
+# 停止写入线程的信号
+STOP: object = object()
+
+
+class TickWriter:
+    """
+    TICK数据异步写入器。
+
+    在后台线程中收集多个合约的TICK数据，达到数量或时间阈值时批量写入数据库，
+    调用方线程只需将数据放入队列。队列已满时put会阻塞或抛出queue.Full异常。
+    """
+
+    def __init__(
+        self,
+        database: MysqlDatabase,
+        batch_size: int = 5000,
+        interval: float = 1.0,
+        max_pending: int = 100000
+    ) -> None:
+        """"""
+        self.database: MysqlDatabase = database
+        self.batch_size: int = batch_size
+        self.interval: float = interval
+
+        self.queue: Queue = Queue(maxsize=max_pending)
+        self.active: bool = True
+        self.error: Exception | None = None
+
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def put(self, tick: TickData, block: bool = True, timeout: float | None = None) -> None:
+        """放入待写入的TICK数据"""
+        if not self.active:
+            raise RuntimeError("TickWriter已经关闭")
+
+        self.queue.put(tick, block, timeout)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """立即写入此前放入的所有数据，返回是否写入成功"""
+        if not self.active:
+            raise RuntimeError("TickWriter已经关闭")
+
+        request: FlushRequest = FlushRequest()
+        self.queue.put(request)
+
+        # 等待期间其他线程关闭时，后台线程退出后不会再处理该请求
+        deadline: float | None = None if timeout is None else monotonic() + timeout
+
+        while True:
+            wait: float = 1 if deadline is None else min(max(deadline - monotonic(), 0), 1)
+            if request.event.wait(wait):
+                return request.result
+
+            if not self.thread.is_alive():
+                return False
+            if deadline is not None and monotonic() >= deadline:
+                return False
+
+    def close(self, timeout: float | None = None) -> None:
+        """写入剩余数据后停止后台线程"""
+        if not self.active:
+            return
+        self.active = False
+
+        self.queue.put(STOP)
+        self.thread.join(timeout)
+
+    def run(self) -> None:
+        """后台线程主循环"""
+        buffer: list[TickData] = []
+        deadline: float = monotonic() + self.interval
+
+        while True:
+            item: object = None
+            try:
+                item = self.queue.get(timeout=max(deadline - monotonic(), 0))
+            except Empty:
+                pass
+
+            if isinstance(item, TickData):
+                buffer.append(item)
+
+                # 未达到数量和时间阈值时继续收集
+                if len(buffer) < self.batch_size and monotonic() < deadline:
+                    continue
+
+            success: bool = self.write(buffer)
+            deadline = monotonic() + self.interval
+
+            if isinstance(item, FlushRequest):
+                item.result = success
+                item.event.set()
+            elif item is STOP:
+                break
+
+            # 写入失败时暂停读取队列，由队列上限对调用方形成反压，之后重试
+            if not success:
+                sleep(self.interval)
+
+    def write(self, buffer: list[TickData]) -> bool:
+        """写入缓存数据，成功后清空缓存"""
+        if not buffer:
+            return True
+
+        try:
+            self.database.save_tick_data_multi(buffer)
+        except Exception as e:
+            self.error = e
+            logger.exception("TICK数据批量写入失败，{}条数据等待重试", len(buffer))
+            return False
+
+        buffer.clear()
+        return True